@@ -92,6 +92,31 @@ def explain(text):
     </div>
     """, unsafe_allow_html=True)
 
+def density_grid(x, y, bins=200, x_range=None, y_range=None):
+    # Server-side 2D binning with one bincount over flattened cell indices; the grid size, not N, sets the payload
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x0, x1 = x_range if x_range is not None else (x.min(), x.max())
+    y0, y1 = y_range if y_range is not None else (y.min(), y.max())
+    x_width = (x1 - x0) or 1.0
+    y_width = (y1 - y0) or 1.0
+    inside = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+    x_index = np.minimum(((x[inside] - x0) / x_width * bins).astype(np.int64), bins - 1)
+    y_index = np.minimum(((y[inside] - y0) / y_width * bins).astype(np.int64), bins - 1)
+    counts = np.bincount(y_index * bins + x_index, minlength=bins * bins).reshape(bins, bins)
+    x_centers = x0 + (np.arange(bins) + 0.5) * x_width / bins
+    y_centers = y0 + (np.arange(bins) + 0.5) * y_width / bins
+    return counts, x_centers, y_centers
+
+def density_plot(x, y, bins=200, x_range=None, y_range=None, title=None, labels=None):
+    counts, x_centers, y_centers = density_grid(x, y, bins, x_range, y_range)
+    labels = labels or {}
+    # Empty cells are left transparent so the grid reads like a scatter plot
+    fig = go.Figure(go.Heatmap(z=np.where(counts > 0, counts, np.nan), x=x_centers, y=y_centers,
+                               colorscale='Viridis', colorbar=dict(title='Points')))
+    fig.update_layout(title=title, xaxis_title=labels.get('x', 'x'), yaxis_title=labels.get('y', 'y'))
+    return fig
+
 def importance_of_data_viz_tab():
     st.header("Importance of Data Visualization")
     
@@ -216,19 +241,37 @@ def interactive_plotting_tab():
     
     st.write("Plotly allows you to create interactive visualizations that users can explore.")
     
+    col1, col2 = st.columns(2)
+    with col2:
+        plot_mode = st.radio("Plot mode", ["Scatter", "Density"], horizontal=True,
+                             help="Density bins the points on the server, so the figure size does not grow with the number of points")
+    with col1:
+        # Scatter sends every point to the browser (about 63 MB at 1M points), so the larger sizes are density-only
+        options = [100, 1_000, 10_000, 100_000]
+        if plot_mode == "Density":
+            options += [1_000_000, 10_000_000]
+        num_points = st.select_slider("Number of data points", options=options, value=100)
+    
     # Generate sample data
     np.random.seed(0)
     data = pd.DataFrame({
-        'x': np.random.rand(100),
-        'y': np.random.rand(100),
-        'size': np.random.rand(100) * 30,
-        'color': np.random.rand(100)
+        'x': np.random.rand(num_points),
+        'y': np.random.rand(num_points),
+        'size': np.random.rand(num_points) * 30,
+        'color': np.random.rand(num_points)
     })
     
-    fig = px.scatter(data, x='x', y='y', size='size', color='color',
-                     title='Interactive Scatter Plot',
-                     labels={'color': 'Color Value'},
-                     hover_data=['x', 'y', 'size'])
+    if plot_mode == "Density":
+        bins = st.slider("Density grid resolution", min_value=50, max_value=500, value=200, step=50)
+        # Narrowing the zoom window re-bins only that region at the same grid resolution
+        zoom_x = st.slider("Zoom: x range", min_value=0.0, max_value=1.0, value=(0.0, 1.0))
+        zoom_y = st.slider("Zoom: y range", min_value=0.0, max_value=1.0, value=(0.0, 1.0))
+        fig = density_plot(data['x'], data['y'], bins, zoom_x, zoom_y, title='Interactive Density Plot')
+    else:
+        fig = px.scatter(data, x='x', y='y', size='size', color='color',
+                         title='Interactive Scatter Plot',
+                         labels={'color': 'Color Value'},
+                         hover_data=['x', 'y', 'size'])
     
     st.plotly_chart(fig)
     
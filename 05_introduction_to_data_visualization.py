@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import numpy as np
+import time
 
 st.set_page_config(layout="wide", page_title="Introduction to Data Visualization")
 
@@ -86,6 +88,39 @@ def explain(text):
     </div>
     """, unsafe_allow_html=True)
 
+def scatter_plot(data, x, y, webgl_threshold=5000, **kwargs):
+    # SVG for small data; above the threshold switch to WebGL (Scattergl), which stays responsive up to millions of points
+    render_mode = 'webgl' if len(data) > webgl_threshold else 'svg'
+    return px.scatter(data, x=x, y=y, render_mode=render_mode, **kwargs), render_mode
+
+def render_caption(data, render_mode):
+    return f"{len(data):,} points rendered with {'WebGL (Scattergl)' if render_mode == 'webgl' else 'SVG'}"
+
+def density_grid(x, y, bins=200, x_range=None, y_range=None):
+    # Server-side 2D binning with one bincount over flattened cell indices; the grid size, not N, sets the payload
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x0, x1 = x_range if x_range is not None else (x.min(), x.max())
+    y0, y1 = y_range if y_range is not None else (y.min(), y.max())
+    x_width = (x1 - x0) or 1.0
+    y_width = (y1 - y0) or 1.0
+    inside = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+    x_index = np.minimum(((x[inside] - x0) / x_width * bins).astype(np.int64), bins - 1)
+    y_index = np.minimum(((y[inside] - y0) / y_width * bins).astype(np.int64), bins - 1)
+    counts = np.bincount(y_index * bins + x_index, minlength=bins * bins).reshape(bins, bins)
+    x_centers = x0 + (np.arange(bins) + 0.5) * x_width / bins
+    y_centers = y0 + (np.arange(bins) + 0.5) * y_width / bins
+    return counts, x_centers, y_centers
+
+def density_plot(x, y, bins=200, x_range=None, y_range=None, title=None, labels=None):
+    counts, x_centers, y_centers = density_grid(x, y, bins, x_range, y_range)
+    labels = labels or {}
+    # Empty cells are left transparent so the grid reads like a scatter plot
+    fig = go.Figure(go.Heatmap(z=np.where(counts > 0, counts, np.nan), x=x_centers, y=y_centers,
+                               colorscale='Viridis', colorbar=dict(title='Points')))
+    fig.update_layout(title=title, xaxis_title=labels.get('x', 'x'), yaxis_title=labels.get('y', 'y'))
+    return fig
+
 def introduction_tab():
     st.header("Introduction to Visualization")
 
@@ -165,9 +200,19 @@ def interactive_example_tab():
     col1, col2 = st.columns([1, 3])  # Create two columns with a 1:3 width ratio
     
     with col1:
-        num_points = st.slider("Number of data points", min_value=10, max_value=1000, value=100, step=10)
+        num_points = st.slider("Number of data points", min_value=10, max_value=1_000_000, value=100, step=10)
         value_range = st.slider("Range of values", min_value=0, max_value=100, value=(0, 50))
+        plot_mode = st.radio("Plot mode", ["Scatter", "Density"], horizontal=True)
+        if plot_mode == "Density":
+            bins = st.slider("Density grid resolution", min_value=50, max_value=500, value=200, step=50)
+            # Narrowing the zoom window re-bins only that region at the same grid resolution
+            zoom_x = zoom_y = (float(value_range[0]), float(value_range[1]))
+            if value_range[0] < value_range[1]:
+                zoom_x = st.slider("Zoom: x range", min_value=zoom_x[0], max_value=zoom_x[1], value=zoom_x)
+                zoom_y = st.slider("Zoom: y range", min_value=zoom_y[0], max_value=zoom_y[1], value=zoom_y)
     
+    # Seeded so reruns (for example moving the zoom sliders) re-bin the same sample instead of a new one
+    np.random.seed(0)
     data = pd.DataFrame({
         'x': np.random.rand(num_points) * (value_range[1] - value_range[0]) + value_range[0],
         'y': np.random.rand(num_points) * (value_range[1] - value_range[0]) + value_range[0],
@@ -175,8 +220,18 @@ def interactive_example_tab():
     })
     
     with col2:
-        fig = px.scatter(data, x='x', y='y', color='category', title='Interactive Scatter Plot')
+        # Frame time: building the figure plus serializing it to the JSON payload sent to the browser
+        start = time.perf_counter()
+        if plot_mode == "Density":
+            fig = density_plot(data['x'], data['y'], bins, zoom_x, zoom_y, title='Interactive Density Plot')
+            description = f"{len(data):,} points binned into a {bins}x{bins} grid"
+        else:
+            fig, render_mode = scatter_plot(data, 'x', 'y', color='category', title='Interactive Scatter Plot')
+            description = render_caption(data, render_mode)
+        payload = fig.to_json()
+        frame_time = time.perf_counter() - start
         st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"{description} | frame time {frame_time * 1000:.0f} ms | payload {len(payload) / 1024 ** 2:.1f} MB")
     
     explain("This interactive example demonstrates how data visualization can help you explore and understand patterns in your data. Try adjusting the sliders to see how the visualization changes!")
 
@@ -3,6 +3,9 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import time
+import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
 
 st.set_page_config(layout="wide", page_title="Which Visualization to Use")
 
@@ -254,6 +257,30 @@ plt.show()
     st.markdown("**Example:**")
     st.write("- How tip varies with the total bill?")
 
+def long_format_series(n_series, n_points):
+    # One columnar buffer (series, date, value) sorted by series, instead of one DataFrame per series
+    dates = pd.date_range(start='2023-01-01', periods=n_points)
+    values = np.cumsum(np.random.randn(n_series, n_points), axis=1)
+    return {
+        'series': np.repeat(np.arange(n_series), n_points),
+        'date': np.tile(dates.to_numpy(), n_series),
+        'value': values.ravel()
+    }
+
+def plot_many_series(ax, buffer, group, x, y):
+    # Every group becomes one line of a single LineCollection, cut from the buffer at the group boundaries
+    groups = buffer[group]
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(groups)) + 1])
+    stops = np.append(starts[1:], len(groups))
+    xs = mdates.date2num(buffer[x]) if np.issubdtype(buffer[x].dtype, np.datetime64) else buffer[x]
+    lines = LineCollection([np.column_stack((xs[a:b], buffer[y][a:b])) for a, b in zip(starts, stops)],
+                           linewidths=0.5, colors=sns.color_palette(n_colors=10), alpha=0.6)
+    ax.add_collection(lines)
+    ax.autoscale_view()
+    if np.issubdtype(buffer[x].dtype, np.datetime64):
+        ax.xaxis_date()
+    return len(starts)
+
 def bivariate_time_series():
     st.header("Bivariate Time Series Visualization")
     explain("Use this when you want to show how a continuous variable changes over time.")
@@ -293,6 +320,22 @@ plt.show()
     
     st.markdown("**Example:**")
     st.write("- How sales varies on different days?")
+    
+    st.subheader("Many Series")
+    explain("With hundreds of series, such as sales per store, draw them all as one LineCollection built from a long-format buffer rather than calling lineplot once per series.")
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        n_series = st.slider("Number of series", min_value=1, max_value=1000, value=100)
+        n_points = st.select_slider("Points per series", options=[100, 1_000, 10_000], value=1_000)
+    with col2:
+        start = time.perf_counter()
+        buffer = long_format_series(n_series, n_points)
+        fig, ax = plt.subplots(figsize=(8, 5))
+        plot_many_series(ax, buffer, 'series', 'date', 'value')
+        ax.set_title(f"{n_series} Line Plots")
+        plt.tight_layout()
+        st.pyplot(fig)
+        st.caption(f"{n_series * n_points:,} points built and drawn in {time.perf_counter() - start:.2f} s")
 
 def bivariate_continuous_categorical():
     st.header("Bivariate Continuous-Categorical Visualization")
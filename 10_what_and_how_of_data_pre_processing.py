@@ -1,6 +1,7 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
+import hashlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.preprocessing import StandardScaler
@@ -331,6 +332,23 @@ def dimensionality_reduction_demo():
     ax.set_title("PCA: Cumulative Explained Variance Ratio")
     st.pyplot(fig)
 
+@st.cache_data
+def column_statistics(fingerprint, column, _values):
+    # Computed once per (dataset fingerprint, column); later reruns are served from Streamlit's cache
+    values = _values.to_numpy(dtype=float)
+    q05, q25, q50, q75, q95 = np.nanquantile(values, [0.05, 0.25, 0.5, 0.75, 0.95])
+    return {
+        'q05': q05, 'Q1': q25, 'median': q50, 'Q3': q75, 'q95': q95, 'IQR': q75 - q25,
+        'mean': np.nanmean(values), 'std': np.nanstd(values, ddof=1),
+        'min': np.nanmin(values), 'max': np.nanmax(values)
+    }
+
+def get_column_statistics(data, column):
+    # Content hash of the column, so the cache entry is reused until the data itself changes
+    hashes = pd.util.hash_pandas_object(data[column], index=False).to_numpy()
+    fingerprint = hashlib.sha1(hashes.tobytes()).hexdigest()
+    return column_statistics(fingerprint, column, data[column])
+
 def eda_and_preprocessing_tab():
     col1, col2 = st.columns([1, 1])
     
@@ -368,16 +386,14 @@ def eda_and_preprocessing_tab():
             st.write(data.isnull().sum())
         elif step == "Remove Outliers":
             st.write("Removing outliers from 'Income'")
-            Q1 = data['Income'].quantile(0.25)
-            Q3 = data['Income'].quantile(0.75)
-            IQR = Q3 - Q1
+            stats = get_column_statistics(data, 'Income')
+            Q1, Q3, IQR = stats['Q1'], stats['Q3'], stats['IQR']
             data_cleaned = data[(data['Income'] >= Q1 - 1.5*IQR) & (data['Income'] <= Q3 + 1.5*IQR)]
             st.write(f"Rows removed: {len(data) - len(data_cleaned)}")
         else:  # Final Analysis
             data['Spending'].fillna(data['Spending'].median(), inplace=True)
-            Q1 = data['Income'].quantile(0.25)
-            Q3 = data['Income'].quantile(0.75)
-            IQR = Q3 - Q1
+            stats = get_column_statistics(data, 'Income')
+            Q1, Q3, IQR = stats['Q1'], stats['Q3'], stats['IQR']
             data_cleaned = data[(data['Income'] >= Q1 - 1.5*IQR) & (data['Income'] <= Q3 + 1.5*IQR)]
             st.write("Correlation matrix:")
             st.write(data_cleaned.corr())
@@ -403,18 +419,16 @@ def eda_and_preprocessing_tab():
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 10))
             sns.boxplot(data=data, y='Income', ax=ax1)
             ax1.set_title("Income Distribution (Before)")
-            Q1 = data['Income'].quantile(0.25)
-            Q3 = data['Income'].quantile(0.75)
-            IQR = Q3 - Q1
+            stats = get_column_statistics(data, 'Income')
+            Q1, Q3, IQR = stats['Q1'], stats['Q3'], stats['IQR']
             data_cleaned = data[(data['Income'] >= Q1 - 1.5*IQR) & (data['Income'] <= Q3 + 1.5*IQR)]
             sns.boxplot(data=data_cleaned, y='Income', ax=ax2)
             ax2.set_title("Income Distribution (After)")
             st.pyplot(fig)
         else:  # Final Analysis
             data['Spending'].fillna(data['Spending'].median(), inplace=True)
-            Q1 = data['Income'].quantile(0.25)
-            Q3 = data['Income'].quantile(0.75)
-            IQR = Q3 - Q1
+            stats = get_column_statistics(data, 'Income')
+            Q1, Q3, IQR = stats['Q1'], stats['Q3'], stats['IQR']
             data_cleaned = data[(data['Income'] >= Q1 - 1.5*IQR) & (data['Income'] <= Q3 + 1.5*IQR)]
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 10))
             sns.scatterplot(data=data_cleaned, x='Age', y='Income', hue='Education', ax=ax1)
@@ -107,6 +107,53 @@ def generate_sample_data(n=100):
     
     return data
 
+def describe_after_fill(series, fill_value):
+    # Describe statistics of series.fillna(fill_value) computed from the null mask, without building the filled copy
+    null_mask = series.isna().to_numpy()
+    n_missing = int(null_mask.sum())
+    if n_missing == 0:
+        return series.describe()
+    if not pd.api.types.is_numeric_dtype(series):
+        # Categorical describe: only the fill value's frequency changes
+        counts = series.value_counts()
+        counts[fill_value] = counts.get(fill_value, 0) + n_missing
+        counts = counts.sort_values(ascending=False, kind='stable')
+        return pd.Series([len(series), len(counts), counts.index[0], counts.iloc[0]],
+                         index=['count', 'unique', 'top', 'freq'], name=series.name)
+    observed = series.to_numpy(dtype=float)[~null_mask]
+    n_observed = len(observed)
+    n_total = n_observed + n_missing
+
+    # Merge the observed moments with n_missing copies of the fill value
+    mean_observed = observed.mean() if n_observed else fill_value
+    m2_observed = ((observed - mean_observed) ** 2).sum()
+    mean = (n_observed * mean_observed + n_missing * fill_value) / n_total
+    m2 = m2_observed + n_observed * n_missing / n_total * (mean_observed - fill_value) ** 2
+    std = np.sqrt(m2 / (n_total - 1)) if n_total > 1 else np.nan
+
+    # Order statistics of the filled column: the fill value occupies ranks [below, below + n_missing)
+    below = int((observed < fill_value).sum())
+    positions = (n_total - 1) * np.array([0.25, 0.5, 0.75])
+    ranks = np.unique(np.concatenate([np.floor(positions), np.ceil(positions)]).astype(int))
+    observed_ranks = np.where(ranks >= below + n_missing, ranks - n_missing, ranks)
+    needed = np.unique(observed_ranks[(ranks < below) | (ranks >= below + n_missing)])
+    partitioned = np.partition(observed, needed) if len(needed) else observed
+    order_stats = {}
+    for rank, observed_rank in zip(ranks, observed_ranks):
+        in_fill_block = below <= rank < below + n_missing
+        order_stats[rank] = fill_value if in_fill_block else partitioned[observed_rank]
+    quartiles = []
+    for position in positions:
+        lower, upper = int(np.floor(position)), int(np.ceil(position))
+        fraction = position - lower
+        quartiles.append(order_stats[lower] + (order_stats[upper] - order_stats[lower]) * fraction)
+
+    minimum = min(observed.min(), fill_value) if n_observed else fill_value
+    maximum = max(observed.max(), fill_value) if n_observed else fill_value
+    return pd.Series([float(n_total), mean, std, minimum, *quartiles, maximum],
+                     index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+                     name=series.name)
+
 def interactive_demo_tab():
     st.header("Interactive Demo: Dealing with Missing Values")
     
@@ -132,20 +179,46 @@ def interactive_demo_tab():
         method = st.radio("Select a method to handle missing values", 
                           ["Drop", "Fill with mean", "Fill with median", "Fill with a custom value"])
     
-    if method == "Drop":
-        data_cleaned = data.dropna(subset=[column])
-    elif method == "Fill with mean":
-        data_cleaned = data.fillna({column: data[column].mean()})
-    elif method == "Fill with median":
-        data_cleaned = data.fillna({column: data[column].median()})
-    elif method == "Fill with mode":
-        data_cleaned = data.fillna({column: data[column].mode()[0]})
+    custom_value = st.text_input("Enter a custom value") if method == "Fill with a custom value" else ""
+    preview = st.checkbox("Fast preview (compute the cleaned statistics without copying the data)", value=True)
+    
+    # A numeric column can only be previewed with a numeric custom value
+    fill_value = custom_value
+    if preview and method == "Fill with a custom value" and custom_value and pd.api.types.is_numeric_dtype(data[column]):
+        try:
+            fill_value = float(custom_value)
+        except ValueError:
+            preview = False
+    
+    if preview:
+        # Dropping NaN rows leaves the column's describe() unchanged, since describe() already skips NaN
+        if method == "Drop":
+            cleaned_stats = data[column].describe()
+        elif method == "Fill with mean":
+            cleaned_stats = describe_after_fill(data[column], data[column].mean())
+        elif method == "Fill with median":
+            cleaned_stats = describe_after_fill(data[column], data[column].median())
+        elif method == "Fill with mode":
+            cleaned_stats = describe_after_fill(data[column], data[column].mode()[0])
+        elif custom_value:
+            cleaned_stats = describe_after_fill(data[column], fill_value)
+        else:
+            cleaned_stats = data[column].describe()
     else:
-        custom_value = st.text_input("Enter a custom value")
-        if custom_value:
-            data_cleaned = data.fillna({column: custom_value})
+        if method == "Drop":
+            data_cleaned = data.dropna(subset=[column])
+        elif method == "Fill with mean":
+            data_cleaned = data.fillna({column: data[column].mean()})
+        elif method == "Fill with median":
+            data_cleaned = data.fillna({column: data[column].median()})
+        elif method == "Fill with mode":
+            data_cleaned = data.fillna({column: data[column].mode()[0]})
         else:
-            data_cleaned = data.copy()
+            if custom_value:
+                data_cleaned = data.fillna({column: custom_value})
+            else:
+                data_cleaned = data.copy()
+        cleaned_stats = data_cleaned[column].describe()
     
     col1, col2 = st.columns(2)
     with col1:
@@ -153,7 +226,7 @@ def interactive_demo_tab():
         st.write(data[column].describe())
     with col2:
         st.write("Cleaned Data")
-        st.write(data_cleaned[column].describe())
+        st.write(cleaned_stats)
     
     st.code(f"""
     # Handling missing values
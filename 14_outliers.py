@@ -39,6 +39,14 @@ def explain(text):
     </div>
     """, unsafe_allow_html=True)
 
+def scatter_plot(data, x, y, webgl_threshold=5000, **kwargs):
+    # SVG for small data; above the threshold switch to WebGL (Scattergl), which stays responsive up to millions of points
+    render_mode = 'webgl' if len(data) > webgl_threshold else 'svg'
+    return px.scatter(data, x=x, y=y, render_mode=render_mode, **kwargs), render_mode
+
+def render_caption(data, render_mode):
+    return f"{len(data):,} points rendered with {'WebGL (Scattergl)' if render_mode == 'webgl' else 'SVG'}"
+
 def generate_sample_data(n=100):
     np.random.seed(42)
     x = np.random.normal(10, 2, n)
@@ -48,16 +56,144 @@ def generate_sample_data(n=100):
     y = np.append(y, [80, 90, 100])
     return pd.DataFrame({'x': x, 'y': y})
 
-def handle_outliers(data, method):
-    Q1 = data.quantile(0.25)
-    Q3 = data.quantile(0.75)
-    IQR = Q3 - Q1
+def kll_sketch(k=200, seed=0):
+    # Mergeable KLL quantile sketch: items at level h each stand for 2**h values of the stream
+    return {'k': k, 'n': 0, 'compactors': [np.empty(0)], 'rng': np.random.default_rng(seed)}
+
+def kll_capacity(sketch, level):
+    depth = len(sketch['compactors']) - level - 1
+    return max(2, int(np.ceil(sketch['k'] * (2 / 3) ** depth)))
+
+def kll_compress(sketch):
+    # Sort an over-full level and promote every other item (random offset) to the level above
+    compactors = sketch['compactors']
+    level = 0
+    while level < len(compactors):
+        if len(compactors[level]) > kll_capacity(sketch, level):
+            if level + 1 == len(compactors):
+                compactors.append(np.empty(0))
+            items = np.sort(compactors[level])
+            odd = len(items) % 2
+            promoted = items[sketch['rng'].integers(2):len(items) - odd:2]
+            compactors[level] = items[len(items) - odd:]
+            compactors[level + 1] = np.concatenate([compactors[level + 1], promoted])
+        level += 1
+    # Adding a level shrinks the capacity of the levels below it, so repeat until every level fits
+    if any(len(items) > kll_capacity(sketch, level) for level, items in enumerate(compactors)):
+        return kll_compress(sketch)
+    return sketch
+
+def kll_update(sketch, values):
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    sketch['n'] += len(values)
+    # Large inputs are compacted as they arrive, in blocks of k items: each block is sorted on its own
+    # (O(n log k), never a full sort) and every other item, from a random offset, moves up one level
+    k = sketch['k'] - sketch['k'] % 2
+    compactors = sketch['compactors']
+    level = 0
+    while len(values) > 2 * k:
+        n_blocks = len(values) // k
+        blocks = np.sort(values[:n_blocks * k].reshape(n_blocks, k), axis=1)
+        picks = sketch['rng'].integers(2, size=(n_blocks, 1)) + 2 * np.arange(k // 2)
+        if level + 1 == len(compactors):
+            compactors.append(np.empty(0))
+        compactors[level] = np.concatenate([compactors[level], values[n_blocks * k:]])
+        values = np.take_along_axis(blocks, picks, axis=1).ravel()
+        level += 1
+    compactors[level] = np.concatenate([compactors[level], values])
+    return kll_compress(sketch)
+
+def kll_merge(sketch, other):
+    # Merging is level-wise concatenation followed by compaction, so sketches built by different workers combine
+    while len(sketch['compactors']) < len(other['compactors']):
+        sketch['compactors'].append(np.empty(0))
+    for level, items in enumerate(other['compactors']):
+        sketch['compactors'][level] = np.concatenate([sketch['compactors'][level], items])
+    sketch['n'] += other['n']
+    return kll_compress(sketch)
+
+def kll_quantiles(sketch, quantiles):
+    items = np.concatenate(sketch['compactors'])
+    weights = np.concatenate([np.full(len(c), 2.0 ** level) for level, c in enumerate(sketch['compactors'])])
+    order = np.argsort(items)
+    cumulative = np.cumsum(weights[order])
+    positions = np.searchsorted(cumulative, np.asarray(quantiles) * cumulative[-1], side='left')
+    return items[order][np.minimum(positions, len(items) - 1)]
+
+def kll_rank_error(k):
+    # Normalized rank error at 99% confidence (empirical fit published with the Apache DataSketches KLL sketch)
+    return 2.296 / k ** 0.9723
+
+def quantile_comparison(values, quantiles=(0.25, 0.75), k=200, n_chunks=8):
+    # Build one sketch per chunk (as separate workers would), merge them and compare with the exact quantiles
+    values = np.asarray(values, dtype=float)
+    sketch = kll_sketch(k)
+    for chunk in np.array_split(values, n_chunks):
+        sketch = kll_merge(sketch, kll_update(kll_sketch(k), chunk))
+    epsilon = kll_rank_error(k)
+    quantiles = np.asarray(quantiles)
+    return pd.DataFrame({
+        'Exact': np.nanquantile(values, quantiles),
+        'Sketch': kll_quantiles(sketch, quantiles),
+        'Lower bound': kll_quantiles(sketch, np.clip(quantiles - epsilon, 0, 1)),
+        'Upper bound': kll_quantiles(sketch, np.clip(quantiles + epsilon, 0, 1)),
+        'Rank error (±)': epsilon
+    }, index=[f"Q{int(q * 100)}" for q in quantiles])
+
+def column_blocks(n_columns, n_rows, memory_limit_mb):
+    # Split columns into blocks whose float64 copy (plus np.nanquantile's partition buffer) fits the memory limit
+    bytes_per_column = max(n_rows, 1) * 8 * 2
+    block_size = max(1, int(memory_limit_mb * 1024 ** 2 // bytes_per_column))
+    return [(start, min(start + block_size, n_columns)) for start in range(0, n_columns, block_size)]
+
+def find_outliers(data, memory_limit_mb=256, approximate=False):
+    # IQR bounds for every numeric column plus a row mask of outliers, computed block by block
+    numeric = data.select_dtypes(include='number')
+    n_rows, n_columns = numeric.shape
+    rows_per_chunk = max(1, int(memory_limit_mb * 1024 ** 2 // (max(n_columns, 1) * 8 * 2)))
+    lower = np.empty(n_columns)
+    upper = np.empty(n_columns)
+    if approximate:
+        # One pass over row chunks feeding a KLL sketch per column; no column is ever sorted in full
+        sketches = [kll_sketch() for _ in range(n_columns)]
+        for start in range(0, n_rows, rows_per_chunk):
+            chunk = numeric.iloc[start:start + rows_per_chunk].to_numpy(dtype=float)
+            for i, sketch in enumerate(sketches):
+                kll_update(sketch, chunk[:, i])
+        for i, sketch in enumerate(sketches):
+            Q1, Q3 = kll_quantiles(sketch, [0.25, 0.75])
+            lower[i] = Q1 - 1.5 * (Q3 - Q1)
+            upper[i] = Q3 + 1.5 * (Q3 - Q1)
+    else:
+        for start, stop in column_blocks(n_columns, n_rows, memory_limit_mb):
+            block = numeric.iloc[:, start:stop].to_numpy(dtype=float)
+            Q1, Q3 = np.nanquantile(block, [0.25, 0.75], axis=0)
+            IQR = Q3 - Q1
+            lower[start:stop] = Q1 - 1.5 * IQR
+            upper[start:stop] = Q3 + 1.5 * IQR
+
+    # Accumulate the row mask over row chunks so no full boolean frame is ever built
+    mask = np.zeros(n_rows, dtype=bool)
+    for start in range(0, n_rows, rows_per_chunk):
+        chunk = numeric.iloc[start:start + rows_per_chunk].to_numpy(dtype=float)
+        mask[start:start + rows_per_chunk] = ((chunk < lower) | (chunk > upper)).any(axis=1)
+    bounds = pd.DataFrame({'lower': lower, 'upper': upper}, index=numeric.columns)
+    return mask, bounds
+
+def handle_outliers(data, method, memory_limit_mb=256, approximate=False):
+    mask, bounds = find_outliers(data, memory_limit_mb, approximate)
     if method == "Remove":
         # Remove outliers using the IQR method
-        data_clean = data[~((data < (Q1 - 1.5 * IQR)) | (data > (Q3 + 1.5 * IQR))).any(axis=1)]
-    else:
+        data_clean = data[~mask]
+    elif method == "Cap":
         # Cap the outliers to the lower and upper bounds
-        data_clean = data.clip(lower=Q1 - 1.5 * IQR, upper=Q3 + 1.5 * IQR, axis=1)
+        data_clean = data.copy()
+        for column in bounds.index:
+            data_clean[column] = np.clip(data_clean[column].to_numpy(), bounds.at[column, 'lower'], bounds.at[column, 'upper'])
+    else:
+        # Flag the outliers in a new column and keep every row
+        data_clean = data.assign(is_outlier=mask)
     return data_clean
 
 def main():
@@ -109,7 +245,8 @@ def interactive_demo_tab():
         column = st.selectbox("Select a column for boxplot", data.columns) if method == "Boxplot" else None
 
         st.subheader("3. Handling Outliers")
-        handling_method = st.radio("Select a method to handle outliers", ["Remove", "Cap"])
+        handling_method = st.radio("Select a method to handle outliers", ["Remove", "Cap", "Flag"])
+        quantile_mode = st.radio("Quantile computation", ["Exact", "Approximate (KLL sketch)"], horizontal=True)
         
         # Explanation for handling methods
         if handling_method == "Remove":
@@ -120,7 +257,7 @@ def interactive_demo_tab():
             - **Q3:** 75th percentile of the data.
             - **IQR:** Interquartile range, calculated as Q3 - Q1.
             """)
-        else:
+        elif handling_method == "Cap":
             explain("""
             **Cap Outliers:** Outliers are capped to the boundaries using the IQR method.
             - **Formula:** Values below Q1 - 1.5 * IQR are set to Q1 - 1.5 * IQR. Values above Q3 + 1.5 * IQR are set to Q3 + 1.5 * IQR.
@@ -128,6 +265,12 @@ def interactive_demo_tab():
             - **Q3:** 75th percentile of the data.
             - **IQR:** Interquartile range, calculated as Q3 - Q1.
             """)
+        else:
+            explain("""
+            **Flag Outliers:** Outliers are marked in a new `is_outlier` column and every row is kept.
+            - **Formula:** A row is flagged if any value lies outside [Q1 - 1.5 * IQR, Q3 + 1.5 * IQR].
+            - **Use case:** Keep the full data for reporting while excluding flagged rows from models later.
+            """)
 
     with col2:
         st.subheader("Visualization")
@@ -138,22 +281,33 @@ def interactive_demo_tab():
                 dict(x=0.5, y=max(data[column]), text="Outliers are points outside the whiskers", showarrow=False, font=dict(color="red"))
             ])
         else:
-            fig = px.scatter(data, x='x', y='y')
+            fig, render_mode = scatter_plot(data, 'x', 'y')
             fig.update_layout(title="Scatter plot", annotations=[
                 dict(x=22, y=90, text="Outliers", showarrow=True, arrowhead=2, ax=-40, ay=-40, font=dict(color="red"))
             ])
 
         st.plotly_chart(fig, use_container_width=True)
+        if method != "Boxplot":
+            st.caption(render_caption(data, render_mode))
 
         # Handle outliers based on selected method
-        data_clean = handle_outliers(data, handling_method)
-        fig_clean = px.scatter(data_clean, x='x', y='y', title="Data after handling outliers")
+        data_clean = handle_outliers(data, handling_method, approximate=quantile_mode != "Exact")
+        fig_clean, render_mode = scatter_plot(data_clean, 'x', 'y', title="Data after handling outliers",
+                                              color='is_outlier' if handling_method == "Flag" else None)
         fig_clean.update_layout(annotations=[
             dict(x=0.5, y=max(data_clean['y']), text=f"Data after {handling_method} handling", showarrow=False, font=dict(color="green"))
         ])
         st.plotly_chart(fig_clean, use_container_width=True)
+        st.caption(render_caption(data_clean, render_mode))
         explain(f"The plot above shows the data after applying the '{handling_method}' method to handle outliers.")
 
+        if quantile_mode != "Exact":
+            st.subheader("Sketch vs Exact Quantiles")
+            for name in data.columns:
+                st.write(f"Column '{name}'")
+                st.write(quantile_comparison(data[name]))
+            explain("The KLL sketch reads the data once in chunks and keeps only a few hundred weighted items per column. Sketches built on separate chunks or workers are merged, and the bounds show the range guaranteed by the sketch's rank error.")
+
 def quiz_tab():
     st.header("Quiz: Outliers")
 
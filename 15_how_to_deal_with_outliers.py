@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+import time
+import hashlib
+from sklearn.ensemble import IsolationForest
 import plotly.graph_objects as go
 
 st.set_page_config(layout="wide", page_title="How to deal with outliers?")
@@ -58,6 +61,14 @@ def explain(text):
     </div>
     """, unsafe_allow_html=True)
 
+def scatter_plot(data, x, y, webgl_threshold=5000, **kwargs):
+    # SVG for small data; above the threshold switch to WebGL (Scattergl), which stays responsive up to millions of points
+    render_mode = 'webgl' if len(data) > webgl_threshold else 'svg'
+    return px.scatter(data, x=x, y=y, render_mode=render_mode, **kwargs), render_mode
+
+def render_caption(data, render_mode):
+    return f"{len(data):,} points rendered with {'WebGL (Scattergl)' if render_mode == 'webgl' else 'SVG'}"
+
 def main():
     st.title("How to Deal with Outliers")
     st.write('**Developed by : Venugopal Adep**')
@@ -102,6 +113,148 @@ def generate_sample_data(n=1000):
     
     return pd.DataFrame({'Income': income, 'Age': age})
 
+def kll_sketch(k=200, seed=0):
+    # Mergeable KLL quantile sketch: items at level h each stand for 2**h values of the stream
+    return {'k': k, 'n': 0, 'compactors': [np.empty(0)], 'rng': np.random.default_rng(seed)}
+
+def kll_capacity(sketch, level):
+    depth = len(sketch['compactors']) - level - 1
+    return max(2, int(np.ceil(sketch['k'] * (2 / 3) ** depth)))
+
+def kll_compress(sketch):
+    # Sort an over-full level and promote every other item (random offset) to the level above
+    compactors = sketch['compactors']
+    level = 0
+    while level < len(compactors):
+        if len(compactors[level]) > kll_capacity(sketch, level):
+            if level + 1 == len(compactors):
+                compactors.append(np.empty(0))
+            items = np.sort(compactors[level])
+            odd = len(items) % 2
+            promoted = items[sketch['rng'].integers(2):len(items) - odd:2]
+            compactors[level] = items[len(items) - odd:]
+            compactors[level + 1] = np.concatenate([compactors[level + 1], promoted])
+        level += 1
+    # Adding a level shrinks the capacity of the levels below it, so repeat until every level fits
+    if any(len(items) > kll_capacity(sketch, level) for level, items in enumerate(compactors)):
+        return kll_compress(sketch)
+    return sketch
+
+def kll_update(sketch, values):
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    sketch['n'] += len(values)
+    # Large inputs are compacted as they arrive, in blocks of k items: each block is sorted on its own
+    # (O(n log k), never a full sort) and every other item, from a random offset, moves up one level
+    k = sketch['k'] - sketch['k'] % 2
+    compactors = sketch['compactors']
+    level = 0
+    while len(values) > 2 * k:
+        n_blocks = len(values) // k
+        blocks = np.sort(values[:n_blocks * k].reshape(n_blocks, k), axis=1)
+        picks = sketch['rng'].integers(2, size=(n_blocks, 1)) + 2 * np.arange(k // 2)
+        if level + 1 == len(compactors):
+            compactors.append(np.empty(0))
+        compactors[level] = np.concatenate([compactors[level], values[n_blocks * k:]])
+        values = np.take_along_axis(blocks, picks, axis=1).ravel()
+        level += 1
+    compactors[level] = np.concatenate([compactors[level], values])
+    return kll_compress(sketch)
+
+def kll_merge(sketch, other):
+    # Merging is level-wise concatenation followed by compaction, so sketches built by different workers combine
+    while len(sketch['compactors']) < len(other['compactors']):
+        sketch['compactors'].append(np.empty(0))
+    for level, items in enumerate(other['compactors']):
+        sketch['compactors'][level] = np.concatenate([sketch['compactors'][level], items])
+    sketch['n'] += other['n']
+    return kll_compress(sketch)
+
+def kll_quantiles(sketch, quantiles):
+    items = np.concatenate(sketch['compactors'])
+    weights = np.concatenate([np.full(len(c), 2.0 ** level) for level, c in enumerate(sketch['compactors'])])
+    order = np.argsort(items)
+    cumulative = np.cumsum(weights[order])
+    positions = np.searchsorted(cumulative, np.asarray(quantiles) * cumulative[-1], side='left')
+    return items[order][np.minimum(positions, len(items) - 1)]
+
+def kll_rank_error(k):
+    # Normalized rank error at 99% confidence (empirical fit published with the Apache DataSketches KLL sketch)
+    return 2.296 / k ** 0.9723
+
+def quantile_comparison(values, quantiles=(0.25, 0.75), k=200, n_chunks=8):
+    # Build one sketch per chunk (as separate workers would), merge them and compare with the exact quantiles
+    values = np.asarray(values, dtype=float)
+    sketch = kll_sketch(k)
+    for chunk in np.array_split(values, n_chunks):
+        sketch = kll_merge(sketch, kll_update(kll_sketch(k), chunk))
+    epsilon = kll_rank_error(k)
+    quantiles = np.asarray(quantiles)
+    return pd.DataFrame({
+        'Exact': np.nanquantile(values, quantiles),
+        'Sketch': kll_quantiles(sketch, quantiles),
+        'Lower bound': kll_quantiles(sketch, np.clip(quantiles - epsilon, 0, 1)),
+        'Upper bound': kll_quantiles(sketch, np.clip(quantiles + epsilon, 0, 1)),
+        'Rank error (±)': epsilon
+    }, index=[f"Q{int(q * 100)}" for q in quantiles])
+
+@st.cache_data
+def column_statistics(fingerprint, column, _values):
+    # Computed once per (dataset fingerprint, column); later reruns are served from Streamlit's cache
+    values = _values.to_numpy(dtype=float)
+    q05, q25, q50, q75, q95 = np.nanquantile(values, [0.05, 0.25, 0.5, 0.75, 0.95])
+    return {
+        'q05': q05, 'Q1': q25, 'median': q50, 'Q3': q75, 'q95': q95, 'IQR': q75 - q25,
+        'mean': np.nanmean(values), 'std': np.nanstd(values, ddof=1),
+        'min': np.nanmin(values), 'max': np.nanmax(values)
+    }
+
+def get_column_statistics(data, column):
+    # Content hash of the column, so the cache entry is reused until the data itself changes
+    hashes = pd.util.hash_pandas_object(data[column], index=False).to_numpy()
+    fingerprint = hashlib.sha1(hashes.tobytes()).hexdigest()
+    return column_statistics(fingerprint, column, data[column])
+
+def iqr_quartiles(data, column, approximate=False):
+    if approximate:
+        return kll_quantiles(kll_update(kll_sketch(), data[column]), [0.25, 0.75])
+    stats = get_column_statistics(data, column)
+    return stats['Q1'], stats['Q3']
+
+def detect_outliers(data, detector, n_jobs=-1):
+    # Row mask of outliers over all numeric columns; a row is flagged if any of its values is flagged
+    values = data.select_dtypes(include='number').to_numpy(dtype=float)
+    if detector == "IQR":
+        Q1, Q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+        IQR = Q3 - Q1
+        return ((values < Q1 - 1.5 * IQR) | (values > Q3 + 1.5 * IQR)).any(axis=1)
+    if detector == "Z-score":
+        z_scores = np.abs(values - np.nanmean(values, axis=0)) / np.nanstd(values, axis=0)
+        return (z_scores > 3).any(axis=1)
+    if detector == "Modified z-score (MAD)":
+        median = np.nanmedian(values, axis=0)
+        mad = np.nanmedian(np.abs(values - median), axis=0)
+        modified_z_scores = 0.6745 * np.abs(values - median) / mad
+        return (modified_z_scores > 3.5).any(axis=1)
+    # Isolation Forest: trees are built and scored in parallel across n_jobs workers
+    model = IsolationForest(n_estimators=100, contamination='auto', n_jobs=n_jobs, random_state=42)
+    return model.fit_predict(values) == -1
+
+def benchmark_detectors(sizes, detectors, n_jobs=-1):
+    results = []
+    for n in sizes:
+        data = generate_sample_data(n)
+        for detector in detectors:
+            start = time.perf_counter()
+            mask = detect_outliers(data, detector, n_jobs)
+            results.append({'Rows': len(data), 'Detector': detector,
+                            'Flagged': int(mask.sum()), 'Runtime (s)': time.perf_counter() - start})
+    results = pd.DataFrame(results)
+    # Side-by-side layout: one row per data size, flagged count and runtime per detector
+    table = results.pivot(index='Rows', columns='Detector', values=['Flagged', 'Runtime (s)'])
+    table['Flagged'] = table['Flagged'].astype(int)
+    return table.swaplevel(axis=1)[detectors]
+
 def interactive_demo_tab():
     st.header("Interactive Demo: Dealing with Outliers")
     
@@ -116,27 +269,28 @@ def interactive_demo_tab():
         fig1 = px.box(data, y="Income", title="Income Distribution")
         st.plotly_chart(fig1)
     with col2:
-        fig2 = px.scatter(data, x="Age", y="Income", title="Age vs Income")
+        fig2, render_mode = scatter_plot(data, "Age", "Income", title="Age vs Income")
         st.plotly_chart(fig2)
+        st.caption(render_caption(data, render_mode))
     
     st.subheader("Dealing with Outliers")
     method = st.radio("Select a method to deal with outliers", ["No treatment", "Drop outliers", "Cap outliers", "IQR method"])
+    quantile_mode = st.radio("Quantile computation for Q1/Q3", ["Exact", "Approximate (KLL sketch)"], horizontal=True)
+    approximate = quantile_mode != "Exact"
     
     if method == "No treatment":
         data_cleaned = data
     elif method == "Drop outliers":
-        Q1 = data['Income'].quantile(0.25)
-        Q3 = data['Income'].quantile(0.75)
+        Q1, Q3 = iqr_quartiles(data, 'Income', approximate)
         IQR = Q3 - Q1
         data_cleaned = data[(data['Income'] >= Q1 - 1.5 * IQR) & (data['Income'] <= Q3 + 1.5 * IQR)]
     elif method == "Cap outliers":
-        lower = data['Income'].quantile(0.05)
-        upper = data['Income'].quantile(0.95)
+        stats = get_column_statistics(data, 'Income')
+        lower, upper = stats['q05'], stats['q95']
         data_cleaned = data.copy()
         data_cleaned['Income'] = data_cleaned['Income'].clip(lower, upper)
     else:  # IQR method
-        Q1 = data['Income'].quantile(0.25)
-        Q3 = data['Income'].quantile(0.75)
+        Q1, Q3 = iqr_quartiles(data, 'Income', approximate)
         IQR = Q3 - Q1
         threshold = Q3 + 1.5 * IQR
         data_cleaned = data[data['Income'] <= threshold]
@@ -144,13 +298,37 @@ def interactive_demo_tab():
     st.write("Original data shape:", data.shape)
     st.write("Cleaned data shape:", data_cleaned.shape)
     
+    if approximate:
+        st.write("Income quartiles: exact vs merged KLL sketch")
+        st.write(quantile_comparison(data['Income']))
+        explain("The sketch is built from chunks of the data in a single pass and merged, the same way separate workers would combine their partial results. The bounds come from the sketch's guaranteed rank error.")
+    
     col3, col4 = st.columns(2)
     with col3:
         fig3 = px.box(data_cleaned, y="Income", title="Income Distribution (After Treatment)")
         st.plotly_chart(fig3)
     with col4:
-        fig4 = px.scatter(data_cleaned, x="Age", y="Income", title="Age vs Income (After Treatment)")
+        fig4, render_mode = scatter_plot(data_cleaned, "Age", "Income", title="Age vs Income (After Treatment)")
         st.plotly_chart(fig4)
+        st.caption(render_caption(data_cleaned, render_mode))
+    
+    st.subheader("Robust Outlier Detectors")
+    detectors = ["IQR", "Z-score", "Modified z-score (MAD)", "Isolation Forest"]
+    detector = st.selectbox("Select a detector (applied to all numeric columns)", detectors)
+    # joblib gives n_jobs=0 no meaning, so the choices skip from -1 (all cores) to 1
+    n_jobs = st.select_slider("Parallel jobs for Isolation Forest (-1 uses all cores)", options=[-1, 1, 2, 3, 4, 5, 6, 7, 8], value=-1)
+    data_flagged = data.assign(Outlier=detect_outliers(data, detector, n_jobs))
+    st.write(f"Rows flagged by {detector}: {int(data_flagged['Outlier'].sum())} of {len(data)}")
+    fig5, render_mode = scatter_plot(data_flagged, "Age", "Income", color="Outlier", title=f"Age vs Income ({detector})")
+    st.plotly_chart(fig5)
+    st.caption(render_caption(data_flagged, render_mode))
+    explain("Z-score flags values more than 3 standard deviations from the mean. The modified z-score uses the median and MAD (median absolute deviation) instead, so the outliers themselves cannot inflate the threshold. Isolation Forest flags points that random splits isolate quickly.")
+    
+    with st.expander("Benchmark detectors as the data grows"):
+        sizes = st.multiselect("Number of rows", [10_000, 100_000, 1_000_000, 5_000_000], default=[10_000, 100_000, 1_000_000])
+        if st.button("Run benchmark"):
+            with st.spinner("Running detectors..."):
+                st.write(benchmark_detectors(sorted(sizes), detectors, n_jobs))
     
     st.code(f"""
     # Dealing with outliers
@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+import hashlib
 
 st.set_page_config(layout="wide", page_title="Scatter Plot Exploration")
 
@@ -57,6 +59,127 @@ def explain(text):
     </div>
     """, unsafe_allow_html=True)
 
+def scatter_plot(data, x, y, webgl_threshold=5000, **kwargs):
+    # SVG for small data; above the threshold switch to WebGL (Scattergl), which stays responsive up to millions of points
+    render_mode = 'webgl' if len(data) > webgl_threshold else 'svg'
+    return px.scatter(data, x=x, y=y, render_mode=render_mode, **kwargs), render_mode
+
+def render_caption(data, render_mode):
+    return f"{len(data):,} points rendered with {'WebGL (Scattergl)' if render_mode == 'webgl' else 'SVG'}"
+
+def density_grid(x, y, bins=200, x_range=None, y_range=None):
+    # Server-side 2D binning with one bincount over flattened cell indices; the grid size, not N, sets the payload
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x0, x1 = x_range if x_range is not None else (x.min(), x.max())
+    y0, y1 = y_range if y_range is not None else (y.min(), y.max())
+    x_width = (x1 - x0) or 1.0
+    y_width = (y1 - y0) or 1.0
+    inside = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+    x_index = np.minimum(((x[inside] - x0) / x_width * bins).astype(np.int64), bins - 1)
+    y_index = np.minimum(((y[inside] - y0) / y_width * bins).astype(np.int64), bins - 1)
+    counts = np.bincount(y_index * bins + x_index, minlength=bins * bins).reshape(bins, bins)
+    x_centers = x0 + (np.arange(bins) + 0.5) * x_width / bins
+    y_centers = y0 + (np.arange(bins) + 0.5) * y_width / bins
+    return counts, x_centers, y_centers
+
+def density_plot(x, y, bins=200, x_range=None, y_range=None, title=None, labels=None):
+    counts, x_centers, y_centers = density_grid(x, y, bins, x_range, y_range)
+    labels = labels or {}
+    # Empty cells are left transparent so the grid reads like a scatter plot
+    fig = go.Figure(go.Heatmap(z=np.where(counts > 0, counts, np.nan), x=x_centers, y=y_centers,
+                               colorscale='Viridis', colorbar=dict(title='Points')))
+    fig.update_layout(title=title, xaxis_title=labels.get('x', 'x'), yaxis_title=labels.get('y', 'y'))
+    return fig
+
+@st.cache_data
+def trendline_points(fingerprint, method, _x, _y, n_bins=1000, n_eval=100, frac=0.3):
+    # Cached per data fingerprint and method, so toggling the trendline reuses the previous fit
+    x = np.asarray(_x, dtype=float)
+    y = np.asarray(_y, dtype=float)
+    if method == "OLS":
+        # Closed-form least squares from the sums n, Σx, Σy, Σx², Σxy
+        n, sum_x, sum_y = len(x), x.sum(), y.sum()
+        slope = (n * (x @ y) - sum_x * sum_y) / (n * (x @ x) - sum_x ** 2)
+        intercept = (sum_y - slope * sum_x) / n
+        x_line = np.array([x.min(), x.max()])
+        return x_line, intercept + slope * x_line
+    # LOWESS-style local linear fit on per-bin sums (tricube weights, no robustness iterations), O(n + bins * n_eval)
+    x0, x1 = x.min(), x.max()
+    index = np.minimum(((x - x0) / ((x1 - x0) or 1.0) * n_bins).astype(np.int64), n_bins - 1)
+    count, sum_x, sum_y, sum_xx, sum_xy = (np.bincount(index, weights=w, minlength=n_bins)
+                                           for w in (None, x, y, x * x, x * y))
+    centers = np.where(count > 0, sum_x / np.maximum(count, 1), 0)
+    x_line = np.linspace(x0, x1, n_eval)
+    distance = np.abs(x_line[:, None] - centers[None, :]) / (frac * (x1 - x0) or 1.0)
+    weights = np.where(distance < 1, (1 - distance ** 3) ** 3, 0)
+    w, wx, wy, wxx, wxy = (weights @ s for s in (count, sum_x, sum_y, sum_xx, sum_xy))
+    denominator = w * wxx - wx ** 2
+    slope = np.divide(w * wxy - wx * wy, denominator, out=np.zeros(n_eval), where=denominator > 0)
+    intercept = np.divide(wy - slope * wx, w, out=np.full(n_eval, np.nan), where=w > 0)
+    return x_line, intercept + slope * x_line
+
+def add_trendline_trace(fig, data, x, y, method="OLS"):
+    # Only the line trace is added; no second figure is built
+    hashes = pd.util.hash_pandas_object(data[[x, y]], index=False).to_numpy()
+    fingerprint = hashlib.sha1(hashes.tobytes()).hexdigest()
+    x_line, y_line = trendline_points(fingerprint, method, data[x], data[y])
+    fig.add_trace(go.Scatter(x=x_line, y=y_line, mode='lines', name=f"{method} trendline",
+                             line=dict(color='red', width=2)))
+    return fig
+
+def add_toggle_menus(fig, trendline_traces, color_traces=None, titles=None):
+    # In-figure buttons that flip trace visibility in the browser, so toggling needs no Streamlit rerun
+    menus = []
+    if color_traces is not None:
+        plain, colored = color_traces
+        menus.append(dict(type='buttons', direction='right', x=0, y=1.18, xanchor='left', yanchor='top', buttons=[
+            dict(label='Single Color', method='update',
+                 args=[{'visible': [True, False]}, {'title.text': titles[0]}, [plain, colored]]),
+            dict(label='Color by Tip Amount', method='update',
+                 args=[{'visible': [False, True]}, {'title.text': titles[1]}, [plain, colored]])
+        ]))
+    menus.append(dict(type='buttons', direction='right', x=1, y=1.18, xanchor='right', yanchor='top', buttons=[
+        dict(label='No Trendline', method='restyle', args=[{'visible': [False, False]}, trendline_traces]),
+        dict(label='OLS', method='restyle', args=[{'visible': [True, False]}, trendline_traces]),
+        dict(label='LOWESS', method='restyle', args=[{'visible': [False, True]}, trendline_traces])
+    ]))
+    fig.update_layout(updatemenus=menus, margin=dict(t=120))
+    return fig
+
+def extend_traces(fig, buffers, update, indices):
+    # Server-side counterpart of Plotly.extendTraces: each batch is copied into a per-trace buffer that doubles
+    # its capacity when full, so appending is amortized O(batch); the trace is refreshed later by sync_traces
+    for key, batches in update.items():
+        for index, batch in zip(indices, batches):
+            batch = np.asarray(batch)
+            if (index, key) not in buffers:
+                current = fig.data[index][key]
+                current = np.asarray(current) if current is not None else np.empty(0, dtype=batch.dtype)
+                buffers[(index, key)] = {'data': current.copy(), 'size': len(current), 'dirty': False}
+            buffer = buffers[(index, key)]
+            size = buffer['size'] + len(batch)
+            if size > len(buffer['data']):
+                grown = np.empty(max(size, 2 * len(buffer['data'])), dtype=np.result_type(buffer['data'], batch))
+                grown[:buffer['size']] = buffer['data'][:buffer['size']]
+                buffer['data'] = grown
+            buffer['data'][buffer['size']:size] = batch
+            buffer['size'], buffer['dirty'] = size, True
+    return fig
+
+def trace_values(buffers, index, key):
+    buffer = buffers[(index, key)]
+    return buffer['data'][:buffer['size']]
+
+def sync_traces(fig, buffers):
+    # The whole figure is serialized on every render anyway, so the one pass over the history (Plotly's
+    # validation of the full array) happens here, once per render and only for traces that changed
+    for (index, key), buffer in buffers.items():
+        if buffer['dirty']:
+            fig.data[index][key] = trace_values(buffers, index, key)
+            buffer['dirty'] = False
+    return fig
+
 def main():
     st.title("Scatter Plot Exploration")
     st.write('**Developed by : Venugopal Adep**')
@@ -95,19 +218,30 @@ def interactive_demo_tab():
     # Create two columns: left for controls and explanation, right for plots
     left_col, right_col = st.columns([1, 2])
     
-    data = generate_sample_data()
-    
     with left_col:
+        plot_mode = st.radio("Plot mode", ["Scatter", "Density"], horizontal=True)
+        # Scatter sends every point twice (plain and colored copies), about 57 MB at 1M points, so it stops at 100k
+        max_points = 1_000_000 if plot_mode == "Density" else 100_000
+        num_points = st.slider("Number of data points", min_value=50, max_value=max_points, value=200, step=50)
+        data = generate_sample_data(num_points)
+        
         st.subheader("Sample Data")
         st.write(data.head())
         
         st.subheader("Customize the Plot")
-        color_by = st.checkbox("Color by Tip Amount")
-        add_trendline = st.checkbox("Add Trendline")
+        if plot_mode == "Density":
+            bins = st.slider("Density grid resolution", min_value=50, max_value=500, value=200, step=50)
+            # Narrowing the zoom window re-bins only that region at the same grid resolution
+            zoom_x = st.slider("Zoom: tip range", min_value=1.0, max_value=10.0, value=(1.0, 10.0))
+            bill_min, bill_max = float(data['total_bill'].min()), float(data['total_bill'].max())
+            zoom_y = st.slider("Zoom: total bill range", min_value=bill_min, max_value=bill_max, value=(bill_min, bill_max))
+        explain("Use the buttons above the plot to color the points by tip amount or to add an OLS or LOWESS trendline. "
+                "Every variant is sent with the plot, so switching happens instantly in your browser.")
         
         explain("This plot shows the relationship between the tip and the total bill. We can observe that as the total bill increases, the tip also tends to increase.")
         
         st.code("""
+        import numpy as np
         import plotly.express as px
         
         # Create a scatter plot
@@ -120,27 +254,72 @@ def interactive_demo_tab():
         #                  title="Relationship between Tip and Total Bill (Colored by Tip)",
         #                  labels={"tip": "Tip", "total_bill": "Total Bill"})
         
-        # Optionally, add a trendline
-        # fig.add_traces(px.scatter(data, x="tip", y="total_bill", trendline="ols").data[1])
+        # Optionally, add a least-squares trendline (closed form, so statsmodels is not needed)
+        # slope, intercept = np.polyfit(data["tip"], data["total_bill"], 1)
+        # x_line = np.array([data["tip"].min(), data["tip"].max()])
+        # fig.add_scatter(x=x_line, y=slope * x_line + intercept, mode="lines", name="OLS trendline")
         
         fig.show()
         """)
     
     with right_col:
         st.subheader("Scatter Plot: Tip vs Total Bill")
-        fig = px.scatter(data, x="tip", y="total_bill", 
-                         title="Relationship between Tip and Total Bill",
-                         labels={"tip": "Tip", "total_bill": "Total Bill"})
-        
-        if color_by:
-            fig = px.scatter(data, x="tip", y="total_bill", color="tip",
-                             title="Relationship between Tip and Total Bill (Colored by Tip)",
-                             labels={"tip": "Tip", "total_bill": "Total Bill"})
+        titles = ["Relationship between Tip and Total Bill",
+                  "Relationship between Tip and Total Bill (Colored by Tip)"]
+        if plot_mode == "Density":
+            # Density cells are already colored by point count, so only the trendline toggle applies here
+            fig = density_plot(data["tip"], data["total_bill"], bins, zoom_x, zoom_y,
+                               title="Density of Tip vs Total Bill",
+                               labels={"x": "Tip", "y": "Total Bill"})
+            color_traces = None
+        else:
+            # Both color variants go into one figure; the colored one starts hidden
+            fig, render_mode = scatter_plot(data, "tip", "total_bill", title=titles[0],
+                                            labels={"tip": "Tip", "total_bill": "Total Bill"})
+            colored, _ = scatter_plot(data, "tip", "total_bill", color="tip",
+                                      labels={"tip": "Tip", "total_bill": "Total Bill"})
+            colored.data[0].update(visible=False, marker=dict(coloraxis=None, colorscale='Plasma',
+                                                              showscale=True, colorbar=dict(title="Tip")))
+            fig.add_traces(colored.data)
+            color_traces = [0, 1]
         
-        if add_trendline:
-            fig.add_traces(px.scatter(data, x="tip", y="total_bill", trendline="ols").data[1])
+        first_trendline = len(fig.data)
+        for method in ["OLS", "LOWESS"]:
+            add_trendline_trace(fig, data, "tip", "total_bill", method)
+        for trace in fig.data[first_trendline:]:
+            trace.visible = False
+        add_toggle_menus(fig, [first_trendline, first_trendline + 1], color_traces, titles)
         
         st.plotly_chart(fig, use_container_width=True)
+        if plot_mode == "Density":
+            st.caption(f"{len(data):,} points binned into a {bins}x{bins} grid")
+        else:
+            st.caption(render_caption(data, render_mode))
+        
+        st.subheader("Streaming Updates")
+        batch_size = st.slider("Points per batch", min_value=10, max_value=100_000, value=1_000, step=10)
+        col1, col2 = st.columns(2)
+        append_batch = col1.button("Append Batch")
+        if col2.button("Reset Stream") or "scatter_stream" not in st.session_state:
+            # WebGL from the start, since the streamed figure keeps growing
+            # generate_sample_data reseeds the global state, so batches come from a session-held Generator
+            stream_data = generate_sample_data()
+            stream_fig = go.Figure(go.Scattergl(
+                x=stream_data["tip"], y=stream_data["total_bill"], mode='markers', name="Tips"))
+            stream_fig.update_layout(xaxis_title="Tip", yaxis_title="Total Bill")
+            st.session_state.scatter_stream = {'figure': stream_fig, 'buffers': {}, 'rng': np.random.default_rng()}
+        stream = st.session_state.scatter_stream
+        stream_fig = stream['figure']
+        
+        if append_batch:
+            # Only the new batch is generated and appended; the existing points are never regenerated
+            new_tips = stream['rng'].uniform(1, 10, batch_size)
+            new_bills = 3 * new_tips + stream['rng'].normal(5, 2, batch_size)
+            extend_traces(stream_fig, stream['buffers'], {'x': [new_tips], 'y': [new_bills]}, [0])
+        
+        sync_traces(stream_fig, stream['buffers'])
+        stream_fig.update_layout(title=f"Streamed Tips ({len(stream_fig.data[0].x):,} points)")
+        st.plotly_chart(stream_fig, use_container_width=True)
 
 def quiz_tab():
     st.header("Quiz: Scatter Plots")
@@ -1,5 +1,7 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import time
 import plotly.express as px
 
 st.set_page_config(layout="wide", page_title="Bar Plot Exploration")
@@ -46,6 +48,43 @@ def generate_sample_data():
     students = [3, 4, 2, 3, 8, 10, 6, 1, 7, 8, 4, 7]
     return pd.DataFrame({'Month': months, 'Number of Students': students})
 
+@st.cache_resource
+def generate_raw_data(n_rows, chunk_size=10_000_000):
+    # One row per student, with birth months drawn in proportion to the sample table and kept as int8 category codes
+    sample = generate_sample_data()
+    probabilities = sample['Number of Students'] / sample['Number of Students'].sum()
+    rng = np.random.default_rng(42)
+    codes = np.empty(n_rows, dtype=np.int8)
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        codes[start:stop] = rng.choice(len(sample), size=stop - start, p=probabilities)
+    return pd.Categorical.from_codes(codes, categories=sample['Month'])
+
+def aggregate_counts(raw, chunk_size=10_000_000):
+    # Rows per category via np.bincount over the integer category codes; chunking bounds bincount's int64 copy
+    if not isinstance(raw, pd.Categorical):
+        raw = pd.Categorical(raw)
+    codes = raw.codes
+    counts = np.zeros(len(raw.categories), dtype=np.int64)
+    for start in range(0, len(codes), chunk_size):
+        chunk = codes[start:start + chunk_size]
+        counts += np.bincount(chunk[chunk >= 0], minlength=len(counts))  # code -1 marks a missing value
+    return pd.Series(counts, index=raw.categories)
+
+def benchmark_aggregation(sizes):
+    results = []
+    for n_rows in sizes:
+        raw = generate_raw_data(n_rows)
+        start = time.perf_counter()
+        aggregate(raw)
+        elapsed = time.perf_counter() - start
+        results.append({'Rows': n_rows, 'Aggregation time (s)': elapsed, 'Rows per second': n_rows / elapsed})
+    return pd.DataFrame(results)
+
+def aggregate(raw):
+    counts = aggregate_counts(raw)
+    return pd.DataFrame({'Month': counts.index, 'Number of Students': counts.values})
+
 def learn_tab():
     st.header("Bar Plot")
     
@@ -66,6 +105,11 @@ def interactive_demo_tab():
     data = generate_sample_data()
     
     with left_col:
+        source = st.radio("Data source", ["Summary table", "Raw rows"], horizontal=True)
+        if source == "Raw rows":
+            n_rows = st.select_slider("Number of raw rows", options=[1_000, 100_000, 1_000_000, 10_000_000, 100_000_000], value=1_000_000)
+            data = aggregate(generate_raw_data(n_rows))
+        
         st.subheader("Sample Data")
         st.write(data)
         
@@ -94,6 +138,12 @@ def interactive_demo_tab():
                          color="Number of Students" if color_bars else None, orientation='h')
         
         st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("Benchmark the raw-row aggregation"):
+        sizes = st.multiselect("Number of raw rows", [1_000_000, 10_000_000, 100_000_000], default=[1_000_000, 10_000_000], key="benchmark_sizes")
+        if st.button("Run benchmark"):
+            with st.spinner("Generating and aggregating raw rows..."):
+                st.write(benchmark_aggregation(sorted(sizes)))
 
 def quiz_tab():
     st.header("Quiz: Bar Plots")
@@ -1,5 +1,8 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import time
+import hashlib
 import plotly.express as px
 
 st.set_page_config(layout="wide", page_title="Stacked Bar Plot Exploration")
@@ -56,6 +59,85 @@ def generate_sample_data():
     non_smoker_percentages = [0.2, 0.73, 0.75, 0.52]
     return pd.DataFrame({'Fitness': fitness_levels, 'Smoker': smoker_percentages, 'Non-smoker': non_smoker_percentages})
 
+@st.cache_resource
+def generate_raw_data(n_rows, chunk_size=10_000_000):
+    # One row per person: a fitness level, then a smoking status drawn with that level's smoker percentage
+    sample = generate_sample_data()
+    rng = np.random.default_rng(42)
+    fitness = np.empty(n_rows, dtype=np.int8)
+    smoking = np.empty(n_rows, dtype=np.int8)
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        fitness[start:stop] = rng.integers(0, len(sample), stop - start)
+        smoker = rng.random(stop - start) < sample['Smoker'].to_numpy()[fitness[start:stop]]
+        smoking[start:stop] = np.where(smoker, 0, 1)
+    return pd.DataFrame({
+        'Fitness': pd.Categorical.from_codes(fitness, categories=sample['Fitness']),
+        'Smoking Status': pd.Categorical.from_codes(smoking, categories=['Smoker', 'Non-smoker'])
+    })
+
+def category_codes(column):
+    # Integer codes and labels for a column; categorical columns reuse their codes, anything else is factorized once
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), column.cat.categories
+    codes, labels = pd.factorize(column, sort=True)
+    return codes, labels
+
+def limit_categories(codes, labels, max_categories):
+    # Keep the most frequent categories (np.argpartition, O(n)) and map the rest to one "Other" code,
+    # so an ID-like column cannot blow up the dense count grid
+    if len(labels) <= max_categories:
+        return codes, labels
+    frequencies = np.bincount(codes[codes >= 0], minlength=len(labels))
+    top = np.sort(np.argpartition(frequencies, -max_categories)[-max_categories:])
+    mapping = np.full(len(labels), max_categories, dtype=np.int64)
+    mapping[top] = np.arange(max_categories)
+    limited = np.where(codes >= 0, mapping[np.maximum(codes, 0)], -1)
+    return limited, pd.Index(list(labels[top]) + ["Other"])
+
+def crosstab(a, b, chunk_size=10_000_000, max_categories=None):
+    # Two-way counts with one np.bincount over the combined codes (a * n_b + b), plus row-normalized shares
+    a_codes, a_labels = category_codes(a)
+    b_codes, b_labels = category_codes(b)
+    if max_categories is not None:
+        a_codes, a_labels = limit_categories(a_codes, a_labels, max_categories)
+        b_codes, b_labels = limit_categories(b_codes, b_labels, max_categories)
+    n_b = len(b_labels)
+    counts = np.zeros(len(a_labels) * n_b, dtype=np.int64)
+    for start in range(0, len(a_codes), chunk_size):
+        a_chunk, b_chunk = a_codes[start:start + chunk_size], b_codes[start:start + chunk_size]
+        # Rows with a missing value in either column carry code -1 and are left out
+        valid = (a_chunk >= 0) & (b_chunk >= 0)
+        combined = a_chunk[valid].astype(np.int64) * n_b + b_chunk[valid]
+        counts += np.bincount(combined, minlength=len(counts))
+    counts = pd.DataFrame(counts.reshape(len(a_labels), n_b), index=pd.Index(a_labels, name=a.name), columns=pd.Index(b_labels, name=b.name))
+    totals = counts.sum(axis=1).to_numpy()[:, None]
+    shares = pd.DataFrame(np.divide(counts.to_numpy(), totals, out=np.zeros(counts.shape), where=totals > 0), index=counts.index, columns=counts.columns)
+    return counts, shares
+
+@st.cache_resource(max_entries=2)
+def load_upload(fingerprint, _source):
+    # Parsed once per file content; widget reruns reuse the same frame
+    return pd.read_csv(_source)
+
+@st.cache_data(max_entries=16)
+def upload_crosstab(fingerprint, row_column, stack_column, _frame, max_categories=50):
+    return crosstab(_frame[row_column], _frame[stack_column], max_categories=max_categories)
+
+def aggregate(raw, chunk_size=10_000_000):
+    _, shares = crosstab(raw['Fitness'], raw['Smoking Status'], chunk_size)
+    return shares.reset_index().rename_axis(columns=None)
+
+def benchmark_aggregation(sizes):
+    results = []
+    for n_rows in sizes:
+        raw = generate_raw_data(n_rows)
+        start = time.perf_counter()
+        aggregate(raw)
+        elapsed = time.perf_counter() - start
+        results.append({'Rows': n_rows, 'Aggregation time (s)': elapsed, 'Rows per second': n_rows / elapsed})
+    return pd.DataFrame(results)
+
 def interactive_demo_tab():
     st.header("Interactive Stacked Bar Plot Demo")
     
@@ -63,8 +145,32 @@ def interactive_demo_tab():
     left_col, right_col = st.columns([1, 2])
     
     data = generate_sample_data()
+    row_column, stack_label, stack_columns = "Fitness", "Smoking Status", ["Smoker", "Non-smoker"]
+    title = "Percentage of Smokers and Non-smokers by Fitness Level"
     
     with left_col:
+        source = st.radio("Data source", ["Summary table", "Raw rows", "Upload CSV"], horizontal=True)
+        if source == "Raw rows":
+            n_rows = st.select_slider("Number of raw rows", options=[1_000, 100_000, 1_000_000, 10_000_000, 100_000_000], value=1_000_000)
+            data = aggregate(generate_raw_data(n_rows))
+        elif source == "Upload CSV":
+            uploaded_file = st.file_uploader("Upload a CSV file with at least two categorical columns", type="csv")
+            if uploaded_file is not None:
+                fingerprint = hashlib.sha1(uploaded_file.getvalue()).hexdigest()
+                uploaded = load_upload(fingerprint, uploaded_file)
+                columns = list(uploaded.columns)
+                row_column = st.selectbox("Bar categories", columns)
+                stack_column = st.selectbox("Stacked categories", [c for c in columns if c != row_column])
+                if stack_column is not None:
+                    counts, shares = upload_crosstab(fingerprint, row_column, stack_column, uploaded)
+                    st.caption(f"{len(uploaded):,} rows → {counts.shape[0]} × {counts.shape[1]} table from a single bincount "
+                               f"(at most the 50 most frequent categories per axis, the rest grouped as Other)")
+                    data = shares.reset_index().rename_axis(columns=None)
+                    data.columns = data.columns.astype(str)
+                    row_column = str(row_column)
+                    stack_label, stack_columns = str(stack_column), list(data.columns[1:])
+                    title = f"Share of {stack_column} by {row_column}"
+        
         st.subheader("Sample Data")
         st.write(data)
         
@@ -75,31 +181,38 @@ def interactive_demo_tab():
         explain("This plot shows the percentage of smokers and non-smokers for different fitness levels. We can observe that the percentage of smokers is very high for people with very poor fitness.")
     
     with right_col:
-        st.subheader("Stacked Bar Plot: Smoking Habits by Fitness Level")
+        st.subheader("Stacked Bar Plot: Smoking Habits by Fitness Level" if row_column == "Fitness" else f"Stacked Bar Plot: {title}")
         
         if orientation == "Vertical":
-            fig = px.bar(data, x="Fitness", y=["Smoker", "Non-smoker"], 
-                         title="Percentage of Smokers and Non-smokers by Fitness Level",
-                         labels={"value": "Percentage", "variable": "Smoking Status"},
+            fig = px.bar(data, x=row_column, y=stack_columns, 
+                         title=title,
+                         labels={"value": "Percentage", "variable": stack_label},
                          color_discrete_map={"Smoker": "#1E90FF", "Non-smoker": "#4B0082"})
             
             if percentage_display:
                 fig.update_traces(texttemplate='%{y:.0%}', textposition='inside')
         
         else:  # Horizontal orientation
-            fig = px.bar(data, y="Fitness", x=["Smoker", "Non-smoker"], 
-                         title="Percentage of Smokers and Non-smokers by Fitness Level",
-                         labels={"value": "Percentage", "variable": "Smoking Status"},
+            fig = px.bar(data, y=row_column, x=stack_columns, 
+                         title=title,
+                         labels={"value": "Percentage", "variable": stack_label},
                          color_discrete_map={"Smoker": "#1E90FF", "Non-smoker": "#4B0082"},
                          orientation='h')
             
             if percentage_display:
                 fig.update_traces(texttemplate='%{x:.0%}', textposition='inside')
         
-        fig.update_layout(yaxis_title="Percentage" if orientation == "Vertical" else "Fitness Level",
-                          xaxis_title="Fitness Level" if orientation == "Vertical" else "Percentage")
+        category_title = "Fitness Level" if row_column == "Fitness" else row_column
+        fig.update_layout(yaxis_title="Percentage" if orientation == "Vertical" else category_title,
+                          xaxis_title=category_title if orientation == "Vertical" else "Percentage")
         
         st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("Benchmark the raw-row aggregation"):
+        sizes = st.multiselect("Number of raw rows", [1_000_000, 10_000_000, 100_000_000], default=[1_000_000, 10_000_000], key="benchmark_sizes")
+        if st.button("Run benchmark"):
+            with st.spinner("Generating and aggregating raw rows..."):
+                st.write(benchmark_aggregation(sorted(sizes)))
 
 
 def quiz_tab():
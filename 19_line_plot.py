@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import hashlib
+import time
 import plotly.express as px
 import plotly.graph_objects as go
 from sklearn.linear_model import LinearRegression
@@ -87,6 +89,199 @@ def generate_sample_data():
     sales = [220, 330, 320, 400, 360, 620, 760, 500, 550, 330]
     return pd.DataFrame({'Day': days, 'Sales': sales})
 
+def long_sales_arrays(n_points):
+    # A year of sales sampled n_points times: weekly seasonality on top of a random walk, plus noise
+    rng = np.random.default_rng(42)
+    days = 1 + np.arange(n_points) * (365 / n_points)
+    trend = np.cumsum(rng.normal(0, 150 / np.sqrt(n_points), n_points))
+    sales = 400 + 150 * np.sin(2 * np.pi * days / 7) + trend + rng.normal(0, 30, n_points)
+    return days, sales
+
+# Only the size currently shown is kept; picking another size replaces it
+@st.cache_resource(max_entries=1)
+def generate_long_sales(n_points):
+    return long_sales_arrays(n_points)
+
+def as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.view(np.int64)
+    return x.astype(float)
+
+def lttb_indices(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: keep the first and last points and, from each interior bucket, the point
+    # forming the largest triangle with the previously kept point and the average of the next bucket
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = as_float(x), np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x[:-1], edges[:-1]) / sizes
+    avg_y = np.add.reduceat(y[:-1], edges[:-1]) / sizes
+    next_x, next_y = np.append(avg_x[1:], x[-1]), np.append(avg_y[1:], y[-1])
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[i] - y[a]))
+        a = lo + np.argmax(area)
+        selected[i + 1] = a
+    return selected
+
+def minmax_indices(x, y, n_out):
+    # Keep the minimum and maximum of each pixel-wide bucket, found with one argmin/argmax over a reshaped view
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    y = np.asarray(y, dtype=float)
+    size = n // n_buckets
+    body = y[:n_buckets * size].reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    parts = [offsets + body.argmin(axis=1), offsets + body.argmax(axis=1), [0, n - 1]]
+    if n_buckets * size < n:
+        tail = y[n_buckets * size:]
+        parts.append([n_buckets * size + tail.argmin(), n_buckets * size + tail.argmax()])
+    return np.unique(np.concatenate(parts))
+
+def downsample(x, y, n_out, method="LTTB"):
+    if method == "LTTB":
+        return lttb_indices(x, y, n_out)
+    return minmax_indices(x, y, n_out)
+
+@st.cache_resource(max_entries=2)
+def load_time_series(fingerprint, _source, time_column=None, value_column=None):
+    # Datetime-indexed, sorted series; cache_resource keeps one shared copy instead of pickling millions of rows
+    if _source is None:
+        # Generated here rather than through generate_long_sales, so the raw arrays are not cached a second time
+        days, sales = long_sales_arrays(fingerprint[1])
+        index = pd.Timestamp("2024-01-01") + pd.to_timedelta(days - 1, unit="D")
+        return pd.Series(sales, index=index, name="Sales")
+    frame = pd.read_csv(_source, usecols=[time_column, value_column])
+    # Unparseable timestamps and values become NaT / NaN and are dropped instead of failing the whole file
+    index = pd.to_datetime(frame[time_column], errors='coerce')
+    values = pd.to_numeric(frame[value_column], errors='coerce')
+    valid = index.notna().to_numpy() & values.notna().to_numpy()
+    if not valid.any():
+        raise ValueError(f"No rows with both a valid timestamp in '{time_column}' and a number in '{value_column}'")
+    series = pd.Series(values.to_numpy(dtype=float)[valid], index=pd.DatetimeIndex(index[valid]), name=value_column)
+    return series.sort_index()
+
+# Resampled and smoothed results have one row per period, so a handful of recent specs stays cheap to keep
+@st.cache_resource(max_entries=4)
+def resample_series(fingerprint, rule, _series):
+    return _series.resample(rule).sum()
+
+@st.cache_resource(max_entries=16)
+def window_series(fingerprint, rule, window, statistic, quantile, _series):
+    # Keyed by the full window spec, so switching back to an earlier aggregation is a cache hit
+    resampled = resample_series(fingerprint, rule, _series)
+    if window <= 1:
+        return resampled
+    rolling = resampled.rolling(window, min_periods=1)
+    if statistic == "Mean":
+        return rolling.mean()
+    if statistic == "Sum":
+        return rolling.sum()
+    return rolling.quantile(quantile)
+
+@st.cache_resource(max_entries=1)
+def generate_store_sales(n_points, max_series=1000):
+    # Long-format columnar buffer (store, day, sales), sorted by store so each series is one contiguous run.
+    # Built once for the largest store count; smaller counts are a prefix of it
+    rng = np.random.default_rng(42)
+    base = rng.uniform(200, 600, (max_series, 1))
+    sales = base + np.cumsum(rng.normal(0, 10, (max_series, n_points)), axis=1)
+    return {
+        'Store': np.repeat(np.arange(max_series, dtype=np.int32), n_points),
+        'Day': np.tile(np.arange(1, n_points + 1, dtype=np.int32), max_series),
+        'Sales': sales.ravel()
+    }
+
+def store_sales(n_series, n_points):
+    # Views into the cached buffer, so moving the store slider never allocates
+    return {name: column[:n_series * n_points] for name, column in generate_store_sales(n_points).items()}
+
+def group_bounds(groups):
+    # Start and stop offsets of each contiguous group, from a single np.diff over the sorted group column
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(groups)) + 1])
+    return starts, np.append(starts[1:], len(groups))
+
+def multi_series_figure(buffer, group, x, y, webgl=False, max_points=None):
+    # One trace per group built from array views into the buffer, without slicing a DataFrame per group
+    trace = go.Scattergl if webgl else go.Scatter
+    starts, stops = group_bounds(buffer[group])
+    traces = []
+    for start, stop in zip(starts, stops):
+        xs, ys = buffer[x][start:stop], buffer[y][start:stop]
+        if max_points is not None and stop - start > max_points:
+            keep = minmax_indices(xs, ys, max_points)
+            xs, ys = xs[keep], ys[keep]
+        traces.append(trace(x=xs, y=ys, mode='lines', name=f"{group} {buffer[group][start]}", line=dict(width=1)))
+    fig = go.Figure(traces)
+    fig.update_layout(showlegend=len(traces) <= 20, xaxis_title=x, yaxis_title=y)
+    return fig
+
+def time_multi_series(n_series, n_points, webgl=True, max_points=None):
+    start = time.perf_counter()
+    buffer = store_sales(n_series, n_points)
+    built = time.perf_counter()
+    fig = multi_series_figure(buffer, 'Store', 'Day', 'Sales', webgl, max_points)
+    emitted = time.perf_counter()
+    payload = len(fig.to_json())
+    serialized = time.perf_counter()
+    return {'Series': n_series, 'Points per series': n_points, 'Points drawn': sum(len(t.x) for t in fig.data),
+            'Build buffer (s)': built - start, 'Build traces (s)': emitted - built,
+            'Serialize (s)': serialized - emitted, 'Payload (MB)': payload / 1e6}
+
+def time_series_section():
+    st.subheader("Time Series: Resampling and Rolling Windows")
+    st.write("Upload a CSV with a timestamp column, or use a generated year of timestamped sales, then aggregate it to regular periods and smooth it with a rolling window.")
+    uploaded_file = st.file_uploader("Upload a CSV with a timestamp column", type="csv")
+    if uploaded_file is not None:
+        columns = list(pd.read_csv(uploaded_file, nrows=0).columns)
+        time_column = st.selectbox("Timestamp column", columns)
+        value_column = st.selectbox("Value column", [c for c in columns if c != time_column])
+        if value_column is None:
+            st.error("The file needs a timestamp column and at least one other column with values.")
+            return
+        fingerprint = (hashlib.sha1(uploaded_file.getvalue()).hexdigest(), time_column, value_column)
+        uploaded_file.seek(0)
+        try:
+            series = load_time_series(fingerprint, uploaded_file, time_column, value_column)
+        except ValueError as error:
+            st.error(str(error))
+            return
+    else:
+        n_timestamps = st.select_slider("Number of generated timestamps", options=[100_000, 1_000_000, 10_000_000, 50_000_000], value=1_000_000)
+        fingerprint = ("generated", n_timestamps)
+        series = load_time_series(fingerprint, None)
+    
+    # Rolling windows always run on resampled periods; raw 50M-row windows would neither fit the cache nor be fast
+    rules = {"Hour": "h", "Day": "D", "Week": "W"}
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rule_name = st.selectbox("Resample to", list(rules), index=1)
+    with col2:
+        window = st.number_input("Rolling window (periods)", min_value=1, max_value=10_000, value=7)
+    with col3:
+        statistic = st.selectbox("Rolling statistic", ["Mean", "Sum", "Quantile"])
+    quantile = st.slider("Quantile", 0.05, 0.95, 0.5, 0.05) if statistic == "Quantile" else None
+    
+    start = time.perf_counter()
+    result = window_series(fingerprint, rules[rule_name], int(window), statistic, quantile, series)
+    elapsed = time.perf_counter() - start
+    
+    idx = downsample(result.index.to_numpy(), result.to_numpy(), 1200)
+    fig = px.line(x=result.index[idx], y=result.to_numpy()[idx],
+                  title=f"{series.name}: {rule_name.lower()} totals, rolling {statistic.lower()} over {int(window)} periods",
+                  labels={"x": "Time", "y": series.name})
+    fig.update_traces(line_color=colors['primary'])
+    st.plotly_chart(fig)
+    st.caption(f"{len(series):,} rows → {len(result):,} periods in {elapsed * 1000:.1f} ms (repeat specs are served from cache)")
+
 def interactive_demo_tab():
     st.header("Interactive Line Plot Demo")
     
@@ -157,27 +352,145 @@ def interactive_demo_tab():
     
     fig.show()
     """)
+    
+    st.subheader("Long Series: Downsampling Before Plotting")
+    st.write("Real sales series can have millions of timestamps, far more than the plot has pixels. Downsampling keeps the visual shape while sending only about one point per pixel to the browser.")
+    n_points = st.select_slider("Number of timestamps", options=[10_000, 100_000, 1_000_000, 5_000_000], value=1_000_000)
+    method = st.radio("Downsampling method", ["LTTB", "Min/max per pixel"], horizontal=True)
+    plot_width = st.slider("Plot width (pixels)", min_value=300, max_value=3000, value=1200, step=100)
+    days, sales = generate_long_sales(n_points)
+    
+    # Zooming re-samples the visible range at full resolution instead of stretching the overview
+    zoom = st.slider("Zoom to days", min_value=1.0, max_value=366.0, value=(1.0, 366.0), step=0.5)
+    lo, hi = np.searchsorted(days, zoom[0]), np.searchsorted(days, zoom[1], side="right")
+    
+    start = time.perf_counter()
+    idx = lo + downsample(days[lo:hi], sales[lo:hi], plot_width, method)
+    elapsed = time.perf_counter() - start
+    
+    fig = px.line(x=days[idx], y=sales[idx], title=f"Sales Trend ({method})",
+                  labels={"x": "Day", "y": "Sales Amount"})
+    fig.update_traces(line_color=colors['secondary'])
+    fig.update_layout(width=plot_width)
+    st.plotly_chart(fig)
+    st.caption(f"{hi - lo:,} points in view → {len(idx):,} drawn, downsampled in {elapsed * 1000:.1f} ms")
+    
+    time_series_section()
+    
+    st.subheader("Many Series: Sales per Store")
+    st.write("With hundreds of stores, each store gets its own trace. The traces are cut from one long-format buffer by offsets, and WebGL keeps the browser responsive.")
+    col1, col2 = st.columns(2)
+    with col1:
+        n_series = st.slider("Number of stores", min_value=1, max_value=1000, value=50)
+        n_days = st.select_slider("Days per store", options=[100, 1_000, 10_000], value=1_000)
+    with col2:
+        webgl = st.checkbox("Render with WebGL", value=True)
+        max_points = st.select_slider("Max points per store", options=[100, 500, 2_000, "All"], value=500)
+    
+    buffer = store_sales(n_series, n_days)
+    start = time.perf_counter()
+    fig = multi_series_figure(buffer, 'Store', 'Day', 'Sales', webgl, None if max_points == "All" else max_points)
+    elapsed = time.perf_counter() - start
+    fig.update_layout(title=f"Sales for {n_series} Stores")
+    st.plotly_chart(fig)
+    st.caption(f"{n_series} traces with {sum(len(t.x) for t in fig.data):,} points built in {elapsed * 1000:.1f} ms")
+    
+    with st.expander("Timing: 1,000 stores × 10,000 days"):
+        if st.button("Run timing"):
+            with st.spinner("Building and serializing 10 million points..."):
+                st.write(pd.DataFrame([time_multi_series(1000, 10_000, webgl, max_points=m) for m in [500, None]]))
+
+def data_fingerprint(data):
+    # Content hash of the table, so cached fits are reused until the data itself changes
+    hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+@st.cache_resource
+def fit_sales_model(fingerprint, _data):
+    return LinearRegression().fit(_data[['Day']].to_numpy(), _data['Sales'].to_numpy())
+
+@st.cache_data
+def forecast_sales(fingerprint, _data, horizon):
+    # The whole horizon is predicted once as a vector; the slider only indexes into it
+    model = fit_sales_model(fingerprint, _data)
+    days = np.arange(1, horizon + 1)
+    return days, model.predict(days.reshape(-1, 1))
+
+def regression_sums(x, y):
+    # Sufficient statistics of a least-squares line; sums from separate batches simply add up
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    return {'n': len(x), 'sx': x.sum(), 'sy': y.sum(), 'sxy': x @ y, 'sxx': x @ x}
+
+def merge_sums(sums, batch_sums):
+    return {key: sums[key] + batch_sums[key] for key in sums}
+
+def fit_from_sums(sums):
+    slope = (sums['n'] * sums['sxy'] - sums['sx'] * sums['sy']) / (sums['n'] * sums['sxx'] - sums['sx'] ** 2)
+    intercept = (sums['sy'] - slope * sums['sx']) / sums['n']
+    return intercept, slope
+
+def online_predictor():
+    st.write("New daily sales arrive in batches. The line is updated from running sums of x, y, xy and x², so each new point costs O(1) however long the history gets.")
+    
+    batch_size = st.select_slider("Observations per batch", options=[1, 10, 1_000, 100_000, 1_000_000], value=10)
+    col1, col2 = st.columns(2)
+    add_batch = col1.button("Add Observations")
+    if col2.button("Reset Stream") or "sales_stream" not in st.session_state:
+        # Only the running sums and a short window of recent points for the plot are kept
+        data = generate_sample_data()
+        st.session_state.sales_stream = {
+            'sums': regression_sums(data['Day'], data['Sales']),
+            'recent': data,
+            'last_day': int(data['Day'].iloc[-1])
+        }
+    stream = st.session_state.sales_stream
+    
+    if add_batch:
+        rng = np.random.default_rng()
+        days = stream['last_day'] + np.arange(1, batch_size + 1)
+        sales = 200 + 40 * days + rng.normal(0, 120, batch_size)
+        stream['sums'] = merge_sums(stream['sums'], regression_sums(days, sales))
+        stream['recent'] = pd.concat([stream['recent'], pd.DataFrame({'Day': days[-1000:], 'Sales': sales[-1000:]})]).tail(1000)
+        stream['last_day'] = int(days[-1])
+    
+    intercept, slope = fit_from_sums(stream['sums'])
+    days_ahead = st.slider("Days ahead", min_value=1, max_value=10, value=5)
+    future_days = stream['last_day'] + np.arange(0, 11)
+    future_sales = intercept + slope * future_days
+    predicted_sales = future_sales[days_ahead]
+    
+    st.write(f"Predicted sales for day {future_days[days_ahead]:,}: ${predicted_sales:,.2f} "
+             f"(fit on {stream['sums']['n']:,} observations: sales = {intercept:,.2f} + {slope:,.2f} × day)")
+    
+    recent = stream['recent']
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=recent['Day'], y=recent['Sales'], mode='lines+markers' if len(recent) <= 100 else 'lines', name='Recent Data'))
+    fig.add_trace(go.Scatter(x=future_days, y=future_sales, mode='lines', line=dict(dash='dash'), name='Predicted Data'))
+    fig.add_trace(go.Scatter(x=[future_days[days_ahead]], y=[predicted_sales], mode='markers', marker=dict(size=12, color=colors['accent'], symbol='star'), name='Predicted Point'))
+    fig.update_layout(title="Online Sales Prediction", xaxis_title="Day", yaxis_title="Sales Amount")
+    st.plotly_chart(fig)
 
 def sales_predictor_tab():
     st.header("Sales Predictor")
     
     st.write("Based on our historical data, let's try to predict sales for a future day!")
     
+    mode = st.radio("Model", ["Fixed table", "Online updates"], horizontal=True)
+    if mode == "Online updates":
+        online_predictor()
+        return
+    
     day = st.slider("Select a future day", min_value=11, max_value=20, value=15)
     
     # Simple linear regression for prediction (this is a very basic model for demonstration purposes)
     data = generate_sample_data()
-    X = data['Day'].values.reshape(-1, 1)
-    y = data['Sales'].values
-    model = LinearRegression().fit(X, y)
+    future_days, future_sales = forecast_sales(data_fingerprint(data), data, 20)
     
-    predicted_sales = model.predict([[day]])[0]
+    predicted_sales = future_sales[day - 1]
     
     st.write(f"Predicted sales for day {day}: ${predicted_sales:.2f}")
     
     # Visualization
-    future_days = list(range(1, 21))
-    future_sales = model.predict([[d] for d in future_days])
     future_data = pd.DataFrame({'Day': future_days, 'Sales': future_sales})
     
     fig = go.Figure()
@@ -1,8 +1,12 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import time
+from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
 import plotly.graph_objects as go
-from scipy.stats import skew
+from scipy.stats import gaussian_kde
+from scipy.special import betaln
 
 st.set_page_config(layout="wide", page_title="Histogram and Skewness Exploration")
 
@@ -89,6 +93,7 @@ def learn_tab():
     
     explain("Histograms help visualize the distribution of data, while skewness measures the asymmetry of the distribution. Understanding both concepts is crucial for data analysis and interpretation.")
 
+@st.cache_data
 def generate_sample_data(skew_type="no"):
     if skew_type == "negative":
         return np.random.beta(5, 2, 1000) * 100 + 40
@@ -97,11 +102,125 @@ def generate_sample_data(skew_type="no"):
     else:
         return np.random.normal(150, 20, 1000)
 
-def plot_histogram(data, title):
-    fig = go.Figure(data=[go.Histogram(x=data, nbinsx=30)])
-    fig.update_layout(title=title, xaxis_title="Value", yaxis_title="Frequency")
+@st.cache_resource(max_entries=8)
+def sorted_values(key, _data):
+    # Sorted once per data set, keyed by the caller's name for it; cache_resource hands back the shared
+    # array instead of unpickling a copy on every rerun. Every bin count after that is a binary search
+    values = np.asarray(_data, dtype=float)
+    return np.sort(values[~np.isnan(values)])
+
+def histogram_counts(values, num_bins):
+    # Uniform bins over the sorted values: counts are differences of np.searchsorted positions, O(bins log n)
+    edges = np.linspace(values[0], values[-1], num_bins + 1)
+    positions = np.searchsorted(values, edges, side='left')
+    positions[-1] = len(values)
+    return edges, np.diff(positions)
+
+def bar_trace(edges, counts, name=None):
+    return go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), name=name)
+
+def histogram_trace(data, key, num_bins=30, name=None):
+    # Binned on the server and sent as bars, so the payload depends on the bin count, not the sample size
+    edges, counts = histogram_counts(sorted_values(key, data), num_bins)
+    return bar_trace(edges, counts, name)
+
+def plot_histogram(data, key, title, num_bins=30):
+    fig = go.Figure(data=[histogram_trace(data, key, num_bins)])
+    fig.update_layout(title=title, xaxis_title="Value", yaxis_title="Frequency", bargap=0)
     return fig
 
+def batch_moments(values):
+    # Count, mean and central moment sums M2, M3, M4 of one chunk, computed with vectorized NumPy passes
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {'n': 0, 'mean': 0.0, 'm2': 0.0, 'm3': 0.0, 'm4': 0.0}
+    mean = values.mean()
+    d = values - mean
+    d2 = d * d
+    return {'n': len(values), 'mean': mean, 'm2': d2.sum(), 'm3': (d2 * d).sum(), 'm4': (d2 * d2).sum()}
+
+def merge_moments(a, b):
+    # Pairwise update of Terriberry / Pebay: exact for any split, so chunks and threads can be combined in any order
+    if a['n'] == 0:
+        return dict(b)
+    if b['n'] == 0:
+        return dict(a)
+    n = a['n'] + b['n']
+    delta = b['mean'] - a['mean']
+    delta_n = delta / n
+    m2 = a['m2'] + b['m2'] + delta * delta_n * a['n'] * b['n']
+    m3 = (a['m3'] + b['m3'] + delta * delta_n ** 2 * a['n'] * b['n'] * (a['n'] - b['n'])
+          + 3 * delta_n * (a['n'] * b['m2'] - b['n'] * a['m2']))
+    m4 = (a['m4'] + b['m4'] + delta * delta_n ** 3 * a['n'] * b['n'] * (a['n'] ** 2 - a['n'] * b['n'] + b['n'] ** 2)
+          + 6 * delta_n ** 2 * (a['n'] ** 2 * b['m2'] + b['n'] ** 2 * a['m2'])
+          + 4 * delta_n * (a['n'] * b['m3'] - b['n'] * a['m3']))
+    return {'n': n, 'mean': a['mean'] + delta_n * b['n'], 'm2': m2, 'm3': m3, 'm4': m4}
+
+def update_moments(moments, values):
+    return merge_moments(moments, batch_moments(values))
+
+def array_moments(values, chunk_size=1_000_000, n_jobs=4):
+    # Chunks are summarized on a thread pool (NumPy releases the GIL in its reductions) and merged afterwards
+    chunks = [values[start:start + chunk_size] for start in range(0, len(values), chunk_size)]
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        return reduce(merge_moments, pool.map(batch_moments, chunks), batch_moments([]))
+
+def csv_moments(source, column, chunk_size=1_000_000):
+    # One pass over the file; only the current chunk of the column is ever in memory
+    moments = batch_moments([])
+    for chunk in pd.read_csv(source, usecols=[column], chunksize=chunk_size):
+        moments = update_moments(moments, pd.to_numeric(chunk[column], errors='coerce'))
+    return moments
+
+def moments_skewness(moments):
+    # Same (biased) estimator as scipy.stats.skew
+    return np.sqrt(moments['n']) * moments['m3'] / moments['m2'] ** 1.5 if moments['m2'] > 0 else 0.0
+
+def moments_kurtosis(moments):
+    # Excess kurtosis, as scipy.stats.kurtosis with its defaults
+    return moments['n'] * moments['m4'] / moments['m2'] ** 2 - 3 if moments['m2'] > 0 else 0.0
+
+def silverman_bandwidth(values):
+    # Silverman's rule of thumb: 0.9 * min(std, IQR / 1.34) * n^(-1/5)
+    q1, q3 = np.percentile(values, [25, 75])
+    spread = min(np.std(values, ddof=1), (q3 - q1) / 1.34) or np.std(values, ddof=1) or 1.0
+    return 0.9 * spread * len(values) ** -0.2
+
+def fft_kde(values, bandwidth=None, grid_size=1024, cut=3):
+    # Gaussian KDE in O(n + g log g): linear binning onto a regular grid, then one FFT convolution with the kernel
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    h = silverman_bandwidth(values) if bandwidth is None else bandwidth
+    grid = np.linspace(values.min() - cut * h, values.max() + cut * h, grid_size)
+    dx = grid[1] - grid[0]
+    # Each value is split between its two neighbouring grid points in proportion to the distance
+    position = (values - grid[0]) / dx
+    left = np.minimum(position.astype(np.int64), grid_size - 2)
+    weight = position - left
+    counts = np.bincount(left, 1 - weight, minlength=grid_size) + np.bincount(left + 1, weight, minlength=grid_size)
+    # Kernel sampled out to 4 bandwidths; zero padding keeps the circular FFT convolution from wrapping around
+    half = min(int(np.ceil(4 * h / dx)), grid_size - 1)
+    kernel = np.exp(-0.5 * (np.arange(-half, half + 1) * dx / h) ** 2) / (h * np.sqrt(2 * np.pi))
+    size = 1 << int(np.ceil(np.log2(grid_size + 2 * half + 1)))
+    density = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)[half:half + grid_size]
+    return grid, np.maximum(density, 0) / len(values)
+
+def benchmark_kde(sizes, grid_size=1024):
+    results = []
+    for n in sizes:
+        values = np.random.default_rng(0).beta(2, 5, n)
+        start = time.perf_counter()
+        grid, density = fft_kde(values, grid_size=grid_size)
+        fft_time = time.perf_counter() - start
+        # Same bandwidth for both: gaussian_kde takes it as a factor of the sample standard deviation
+        start = time.perf_counter()
+        reference = gaussian_kde(values, bw_method=silverman_bandwidth(values) / np.std(values, ddof=1))(grid)
+        scipy_time = time.perf_counter() - start
+        results.append({'Samples': n, 'FFT KDE (s)': fft_time, 'scipy gaussian_kde (s)': scipy_time,
+                        'Speedup': scipy_time / fft_time, 'Max relative difference': np.abs(density - reference).max() / reference.max()})
+    return pd.DataFrame(results)
+
 def interactive_demo_tab():
     st.header("Interactive Histogram Demo")
     
@@ -114,10 +233,10 @@ def interactive_demo_tab():
     else:
         data = generate_sample_data("no")
     
-    fig = plot_histogram(data, f"Histogram with {skew_type}")
+    fig = plot_histogram(data, skew_type, f"Histogram with {skew_type}")
     st.plotly_chart(fig)
     
-    skewness = skew(data)
+    skewness = moments_skewness(array_moments(data))
     st.write(f"Skewness: {skewness:.2f}")
     
     explain(f"This histogram shows a distribution with {skew_type.lower()}. "
@@ -129,15 +248,70 @@ def interactive_demo_tab():
     show_kde = st.checkbox("Show KDE (Kernel Density Estimation)")
     
     fig = go.Figure()
-    fig.add_trace(go.Histogram(x=data, nbinsx=num_bins, name="Histogram"))
+    fig.add_trace(histogram_trace(data, skew_type, num_bins, name="Histogram"))
     
     if show_kde:
-        kde = np.histogram(data, bins=num_bins, density=True)[0]
-        x = np.linspace(min(data), max(data), num_bins)
-        fig.add_trace(go.Scatter(x=x, y=kde, mode='lines', name='KDE'))
+        # Density times sample size times bin width puts the curve on the histogram's count scale
+        x, density = fft_kde(data)
+        bin_width = (np.max(data) - np.min(data)) / num_bins
+        fig.add_trace(go.Scatter(x=x, y=density * len(data) * bin_width, mode='lines', name='KDE'))
     
-    fig.update_layout(title=f"Customized Histogram with {skew_type}", xaxis_title="Value", yaxis_title="Frequency")
+    fig.update_layout(title=f"Customized Histogram with {skew_type}", xaxis_title="Value", yaxis_title="Frequency", bargap=0)
     st.plotly_chart(fig)
+    
+    with st.expander("Benchmark: FFT KDE vs scipy gaussian_kde"):
+        sizes = st.multiselect("Number of samples", [1_000, 10_000, 100_000, 1_000_000], default=[1_000, 10_000, 100_000])
+        if st.button("Run benchmark"):
+            with st.spinner("Estimating densities..."):
+                st.write(benchmark_kde(sorted(sizes)))
+    
+    st.subheader("Skewness of Your Own Data")
+    st.write("Skewness and kurtosis are computed in one streaming pass: the file is read in chunks and each chunk's moments are merged into a running total.")
+    uploaded_file = st.file_uploader("Upload a CSV file", type="csv")
+    if uploaded_file is not None:
+        column = st.selectbox("Column", list(pd.read_csv(uploaded_file, nrows=0).columns))
+        uploaded_file.seek(0)
+        start = time.perf_counter()
+        moments = csv_moments(uploaded_file, column)
+        elapsed = time.perf_counter() - start
+        if moments['n'] == 0:
+            st.error(f"Column '{column}' has no numeric values to summarize.")
+        else:
+            st.write(pd.DataFrame([{
+                'Count': moments['n'], 'Mean': moments['mean'],
+                'Std': np.sqrt(moments['m2'] / (moments['n'] - 1)) if moments['n'] > 1 else np.nan,
+                'Skewness': moments_skewness(moments), 'Excess kurtosis': moments_kurtosis(moments)
+            }]))
+            st.caption(f"One pass over {moments['n']:,} values in {elapsed:.2f} s")
+
+def beta_skewness(alpha, beta):
+    return 2 * (beta - alpha) * np.sqrt(alpha + beta + 1) / ((alpha + beta + 2) * np.sqrt(alpha * beta))
+
+def beta_pdf(x, alpha, beta):
+    # Evaluated in log space so large shape parameters do not overflow
+    return np.exp((alpha - 1) * np.log(x) + (beta - 1) * np.log1p(-x) - betaln(alpha, beta))
+
+def sample_generator():
+    # One Generator per browser session, kept in session state: np.random.Generator is not thread-safe,
+    # so sessions served on different threads must not share one
+    if "beta_generator" not in st.session_state:
+        st.session_state.beta_generator = np.random.default_rng()
+    return st.session_state.beta_generator
+
+def bin_beta_samples(rng, alpha, beta, n, num_bins=100, chunk_size=1_000_000):
+    # Samples are drawn and binned chunk by chunk onto fixed bins over [0, 100]; only counts and moments are kept
+    counts = np.zeros(num_bins, dtype=np.int64)
+    moments = batch_moments([])
+    for start in range(0, n, chunk_size):
+        values = rng.beta(alpha, beta, min(chunk_size, n - start)) * 100
+        counts += np.bincount(np.minimum((values * num_bins / 100).astype(np.int64), num_bins - 1), minlength=num_bins)
+        moments = update_moments(moments, values)
+    return counts, moments
+
+@st.cache_data
+def beta_sample_summary(alpha, beta, n, num_bins=100):
+    # Shared across sessions, so each cache miss draws from its own local Generator
+    return bin_beta_samples(np.random.default_rng(), alpha, beta, n, num_bins)
 
 def skewness_generator_tab():
     st.header("Skewness Generator")
@@ -147,13 +321,34 @@ def skewness_generator_tab():
     alpha = st.slider("Alpha", min_value=0.1, max_value=10.0, value=2.0, step=0.1)
     beta = st.slider("Beta", min_value=0.1, max_value=10.0, value=5.0, step=0.1)
     
-    data = np.random.beta(alpha, beta, 1000) * 100
+    sample_size = st.select_slider("Sample Size", options=[1_000, 10_000, 100_000, 1_000_000, 10_000_000], value=1_000)
+    
+    col1, col2 = st.columns(2)
+    draw_more = col1.button("Draw More Samples")
+    state = st.session_state.get("skewness_stream")
+    if col2.button("Reset Samples") or state is None or state['params'] != (alpha, beta, sample_size):
+        # The running counts and moments belong to one parameter set; new draws are merged in instead of recomputed
+        counts, moments = beta_sample_summary(alpha, beta, sample_size)
+        state = st.session_state.skewness_stream = {'params': (alpha, beta, sample_size), 'counts': counts, 'moments': moments}
+    elif draw_more:
+        counts, moments = bin_beta_samples(sample_generator(), alpha, beta, sample_size)
+        state['counts'] = state['counts'] + counts
+        state['moments'] = merge_moments(state['moments'], moments)
+    n = state['moments']['n']
     
-    fig = plot_histogram(data, f"Generated Distribution (Alpha: {alpha}, Beta: {beta})")
+    edges = np.linspace(0, 100, len(state['counts']) + 1)
+    fig = go.Figure(data=[bar_trace(edges, state['counts'], name="Samples")])
+    # Theoretical density on the sample scale: pdf(x / 100) / 100 per unit, times n and the bin width for counts
+    x = np.linspace(0, 100, 502)[1:-1]
+    fig.add_trace(go.Scatter(x=x, y=beta_pdf(x / 100, alpha, beta) / 100 * n * (edges[1] - edges[0]),
+                             mode='lines', name='Beta PDF', line=dict(color=colors['secondary'])))
+    fig.update_layout(title=f"Generated Distribution (Alpha: {alpha}, Beta: {beta})", xaxis_title="Value",
+                      yaxis_title="Frequency", bargap=0, yaxis_range=[0, state['counts'].max() * 1.2])
     st.plotly_chart(fig)
     
-    skewness = skew(data)
-    st.write(f"Skewness: {skewness:.2f}")
+    skewness = beta_skewness(alpha, beta)
+    st.write(f"Theoretical skewness: {skewness:.3f}")
+    st.write(f"Sample skewness: {moments_skewness(state['moments']):.3f} (excess kurtosis: {moments_kurtosis(state['moments']):.2f}, {n:,} samples)")
     
     if skewness < -0.5:
         st.write("This distribution is negatively skewed (left-skewed).")
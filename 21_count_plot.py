@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import time
 import plotly.graph_objects as go
 import plotly.express as px
 
@@ -93,6 +94,43 @@ def generate_sample_data():
     counts = [76, 88, 62, 19]
     return pd.DataFrame({'Degree': degrees, 'Count': counts})
 
+@st.cache_resource
+def generate_raw_data(n_rows, chunk_size=10_000_000):
+    # One row per employee, with degrees drawn in proportion to the sample table and kept as int8 category codes
+    sample = generate_sample_data()
+    probabilities = sample['Count'] / sample['Count'].sum()
+    rng = np.random.default_rng(42)
+    codes = np.empty(n_rows, dtype=np.int8)
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        codes[start:stop] = rng.choice(len(sample), size=stop - start, p=probabilities)
+    return pd.Categorical.from_codes(codes, categories=sample['Degree'])
+
+def aggregate_counts(raw, chunk_size=10_000_000):
+    # Rows per category via np.bincount over the integer category codes; chunking bounds bincount's int64 copy
+    if not isinstance(raw, pd.Categorical):
+        raw = pd.Categorical(raw)
+    codes = raw.codes
+    counts = np.zeros(len(raw.categories), dtype=np.int64)
+    for start in range(0, len(codes), chunk_size):
+        chunk = codes[start:start + chunk_size]
+        counts += np.bincount(chunk[chunk >= 0], minlength=len(counts))  # code -1 marks a missing value
+    return pd.Series(counts, index=raw.categories)
+
+def benchmark_aggregation(sizes):
+    results = []
+    for n_rows in sizes:
+        raw = generate_raw_data(n_rows)
+        start = time.perf_counter()
+        aggregate(raw)
+        elapsed = time.perf_counter() - start
+        results.append({'Rows': n_rows, 'Aggregation time (s)': elapsed, 'Rows per second': n_rows / elapsed})
+    return pd.DataFrame(results)
+
+def aggregate(raw):
+    counts = aggregate_counts(raw)
+    return pd.DataFrame({'Degree': counts.index, 'Count': counts.values})
+
 def plot_count(data, title, orientation='v'):
     if orientation == 'v':
         fig = px.bar(data, x='Degree', y='Count', title=title, color='Degree')
@@ -101,16 +139,72 @@ def plot_count(data, title, orientation='v'):
     fig.update_layout(showlegend=False)
     return fig
 
+@st.cache_resource
+def generate_high_cardinality_data(n_rows, n_categories):
+    # Zipf-distributed category codes, so a few categories dominate and a long tail holds the rest
+    rng = np.random.default_rng(42)
+    codes = ((rng.zipf(1.3, n_rows) - 1) % n_categories).astype(np.int32)
+    categories = [f"Certification {i + 1}" for i in range(n_categories)]
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+def top_k_with_other(data, k, sort=True):
+    # np.argpartition finds the k largest counts in O(n); only those k are sorted and the rest become one "Other" bar
+    counts = data['Count'].to_numpy()
+    if len(counts) <= k:
+        top = np.arange(len(counts))
+    else:
+        top = np.argpartition(counts, -k)[-k:]
+    top = top[np.argsort(-counts[top], kind='stable')] if sort else np.sort(top)
+    result = data.iloc[top]
+    if len(top) < len(counts):
+        other = pd.DataFrame({'Degree': ['Other'], 'Count': [counts.sum() - counts[top].sum()]})
+        result = pd.concat([result, other], ignore_index=True)
+    return result
+
+def simulate_hiring_rounds(data, new_hires, probabilities, n_rounds, band=90, seed=None):
+    # All rounds in one vectorized multinomial call: an (n_rounds, n_degrees) matrix of hires per degree
+    rng = np.random.default_rng(seed)
+    final_counts = data['Count'].to_numpy() + rng.multinomial(new_hires, probabilities, size=n_rounds)
+    lower, upper = np.percentile(final_counts, [(100 - band) / 2, (100 + band) / 2], axis=0)
+    return pd.DataFrame({
+        'Degree': data['Degree'],
+        'Mean Count': final_counts.mean(axis=0),
+        'Lower': lower,
+        'Upper': upper
+    })
+
+def plot_count_with_bands(summary, title):
+    fig = px.bar(summary, x='Degree', y='Mean Count', title=title, color='Degree',
+                 error_y=summary['Upper'] - summary['Mean Count'],
+                 error_y_minus=summary['Mean Count'] - summary['Lower'])
+    fig.update_layout(showlegend=False)
+    return fig
+
 def interactive_demo_tab():
     st.header("Interactive Count Plot Demo")
     
     data = generate_sample_data()
     
+    source = st.radio("Data source", ["Summary table", "Raw rows", "High-cardinality raw rows"], horizontal=True)
+    if source == "Raw rows":
+        n_rows = st.select_slider("Number of raw rows", options=[1_000, 100_000, 1_000_000, 10_000_000, 100_000_000], value=1_000_000)
+        data = aggregate(generate_raw_data(n_rows))
+    elif source == "High-cardinality raw rows":
+        n_rows = st.select_slider("Number of raw rows", options=[100_000, 1_000_000, 10_000_000], value=1_000_000)
+        n_categories = st.select_slider("Number of distinct categories", options=[1_000, 10_000, 100_000], value=100_000)
+        data = aggregate(generate_high_cardinality_data(n_rows, n_categories))
+    top_k = st.slider("Maximum number of bars (top K, the rest are grouped as 'Other')", 2, 50, 20)
+    
+    # Only the top K rows and "Other" are sent to the browser, never the full aggregated table
+    top_data = top_k_with_other(data, top_k, sort=False)
+    
     st.subheader("Sample Data")
-    st.write(data)
+    st.write(top_data)
+    if len(data) > top_k:
+        st.caption(f"Top {top_k} of {len(data):,} categories; the rest are grouped as 'Other'.")
     
     st.subheader("Count Plot: Employee Degrees")
-    fig = plot_count(data, "Count of Employees by Degree")
+    fig = plot_count(top_data, "Count of Employees by Degree")
     st.plotly_chart(fig)
     
     explain("This plot shows the count of employees for each type of degree in an organization. "
@@ -121,8 +215,7 @@ def interactive_demo_tab():
     sort_bars = st.checkbox("Sort Bars by Count")
     show_percentages = st.checkbox("Show Percentages")
     
-    if sort_bars:
-        data = data.sort_values('Count', ascending=False)
+    data = top_k_with_other(data, top_k, sort=sort_bars)
     
     fig = plot_count(data, "Customized Count Plot of Employee Degrees", 
                      orientation='v' if orientation == "Vertical" else 'h')
@@ -136,6 +229,12 @@ def interactive_demo_tab():
             fig.update_traces(text=percentages.astype(str) + '%', textposition='inside')
     
     st.plotly_chart(fig)
+    
+    with st.expander("Benchmark the raw-row aggregation"):
+        sizes = st.multiselect("Number of raw rows", [1_000_000, 10_000_000, 100_000_000], default=[1_000_000, 10_000_000], key="benchmark_sizes")
+        if st.button("Run benchmark"):
+            with st.spinner("Generating and aggregating raw rows..."):
+                st.write(benchmark_aggregation(sorted(sizes)))
 
 def employee_simulator_tab():
     st.header("Employee Degree Simulator")
@@ -145,7 +244,7 @@ def employee_simulator_tab():
     data = generate_sample_data()
     total_employees = data['Count'].sum()
     
-    new_hires = st.number_input("Number of New Hires", min_value=1, max_value=100, value=10)
+    new_hires = st.number_input("Number of New Hires", min_value=1, max_value=10_000_000, value=10)
     
     st.write("Set the probability of hiring for each degree:")
     master_prob = st.slider("Master's Degree", 0.0, 1.0, 0.3, 0.1)
@@ -154,19 +253,37 @@ def employee_simulator_tab():
     secondary_prob = 1 - (master_prob + bachelor_prob + phd_prob)
     st.write(f"Secondary Degree: {secondary_prob:.1f}")
     
+    mode = st.radio("Simulation mode", ["Single draw", "Monte Carlo"], horizontal=True)
+    if mode == "Monte Carlo":
+        n_rounds = st.select_slider("Number of simulated hiring rounds", options=[100, 1_000, 10_000, 100_000], value=10_000)
+        band = st.slider("Percentile band (%)", 50, 99, 90)
+    
     if st.button("Simulate Hiring"):
-        new_employees = np.random.choice(data['Degree'], new_hires, p=[master_prob, bachelor_prob, phd_prob, secondary_prob])
-        for degree in new_employees:
-            data.loc[data['Degree'] == degree, 'Count'] += 1
-        
-        fig = plot_count(data, f"Updated Employee Degree Distribution (After Hiring {new_hires} New Employees)")
-        st.plotly_chart(fig)
+        # One multinomial draw gives the number of hires per degree, so the cost does not grow with new_hires
+        probabilities = np.clip([master_prob, bachelor_prob, phd_prob, secondary_prob], 0, None)
+        probabilities = probabilities / probabilities.sum()
         
-        st.write("Updated Employee Counts:")
-        st.write(data)
-        
-        explain(f"After simulating the hiring of {new_hires} new employees, you can see how the distribution of degrees has changed. "
-                f"This simulation helps understand how hiring decisions can impact the overall composition of employee qualifications.")
+        if mode == "Monte Carlo":
+            summary = simulate_hiring_rounds(data, new_hires, probabilities, n_rounds, band)
+            fig = plot_count_with_bands(summary, f"Expected Employee Degree Distribution over {n_rounds:,} Rounds of {new_hires} Hires")
+            st.plotly_chart(fig)
+            
+            st.write(f"Mean counts with the {band}% percentile band:")
+            st.write(summary)
+            
+            explain(f"Instead of a single random outcome, {n_rounds:,} hiring rounds were simulated at once. "
+                    f"The bars show the average result and the error bars show the range that {band}% of rounds fall into.")
+        else:
+            data['Count'] += np.random.multinomial(new_hires, probabilities)
+            
+            fig = plot_count(data, f"Updated Employee Degree Distribution (After Hiring {new_hires} New Employees)")
+            st.plotly_chart(fig)
+            
+            st.write("Updated Employee Counts:")
+            st.write(data)
+            
+            explain(f"After simulating the hiring of {new_hires} new employees, you can see how the distribution of degrees has changed. "
+                    f"This simulation helps understand how hiring decisions can impact the overall composition of employee qualifications.")
 
 def quiz_tab():
     st.header("Quiz: Count Plots")
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import time
 import plotly.graph_objects as go
 import plotly.express as px
 
@@ -99,13 +100,117 @@ def generate_sample_data():
     dinner_tips = np.random.normal(3, 1.5, 100)
     return pd.DataFrame({'Lunch': lunch_tips, 'Dinner': dinner_tips})
 
-def plot_boxplot(data, title):
+@st.cache_resource
+def generate_large_tips(n_rows):
+    # float32 keeps 100M tips per meal at 400 MB each
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        'Lunch': rng.standard_normal(n_rows, dtype=np.float32) * 1 + 2.5,
+        'Dinner': rng.standard_normal(n_rows, dtype=np.float32) * 1.5 + 3
+    })
+
+def box_statistics(values, max_outliers=1000, seed=0):
+    # Quartiles from a single np.nanquantile call; whiskers, mean and notch follow from them
+    values = np.asarray(values)
+    q1, median, q3 = np.nanquantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    inside = (values >= lower) & (values <= upper)
+    n = np.count_nonzero(~np.isnan(values))
+    outliers = values[~inside & ~np.isnan(values)]
+    if len(outliers) > max_outliers:
+        outliers = np.random.default_rng(seed).choice(outliers, max_outliers, replace=False)
+    return {
+        'q1': q1, 'median': median, 'q3': q3,
+        'lowerfence': values[inside].min(), 'upperfence': values[inside].max(),
+        'mean': np.nanmean(values), 'notchspan': 1.57 * iqr / np.sqrt(n),
+        'outliers': outliers, 'n': n
+    }
+
+@st.cache_data
+def cached_box_statistics(cache_key, column, _values, max_outliers=1000):
+    # Toggling the mean or notch only restyles the boxes, so the statistics are reused
+    return box_statistics(_values, max_outliers)
+
+def plot_boxplot(data, title, precomputed=False, max_outliers=1000, cache_key=None, **box_options):
     fig = go.Figure()
     for column in data.columns:
-        fig.add_trace(go.Box(y=data[column], name=column))
+        if not precomputed:
+            fig.add_trace(go.Box(y=data[column], name=column, **box_options))
+            continue
+        # Only the summary values and a capped sample of outliers are sent, whatever the number of rows
+        values = data[column].to_numpy()
+        if cache_key is None:
+            stats = box_statistics(values, max_outliers)
+        else:
+            stats = cached_box_statistics(cache_key, column, values, max_outliers)
+        fig.add_trace(go.Box(
+            x=[column], name=column, q1=[stats['q1']], median=[stats['median']], q3=[stats['q3']],
+            lowerfence=[stats['lowerfence']], upperfence=[stats['upperfence']],
+            mean=[stats['mean']], notchspan=[stats['notchspan']],
+            notched=box_options.get('notched', False), boxmean=box_options.get('boxmean', False),
+            boxpoints=False, legendgroup=column
+        ))
+        if box_options.get('boxpoints', 'outliers') is not False and len(stats['outliers']):
+            fig.add_trace(go.Scatter(
+                x=np.full(len(stats['outliers']), column), y=stats['outliers'], mode='markers',
+                marker=dict(size=4, opacity=0.6), name=f"{column} outliers", legendgroup=column, showlegend=False
+            ))
     fig.update_layout(title=title)
     return fig
 
+def extend_traces(fig, buffers, update, indices):
+    # Server-side counterpart of Plotly.extendTraces: each batch is copied into a per-trace buffer that doubles
+    # its capacity when full, so appending is amortized O(batch); the trace is refreshed later by sync_traces
+    for key, batches in update.items():
+        for index, batch in zip(indices, batches):
+            batch = np.asarray(batch)
+            if (index, key) not in buffers:
+                current = fig.data[index][key]
+                current = np.asarray(current) if current is not None else np.empty(0, dtype=batch.dtype)
+                buffers[(index, key)] = {'data': current.copy(), 'size': len(current), 'dirty': False}
+            buffer = buffers[(index, key)]
+            size = buffer['size'] + len(batch)
+            if size > len(buffer['data']):
+                grown = np.empty(max(size, 2 * len(buffer['data'])), dtype=np.result_type(buffer['data'], batch))
+                grown[:buffer['size']] = buffer['data'][:buffer['size']]
+                buffer['data'] = grown
+            buffer['data'][buffer['size']:size] = batch
+            buffer['size'], buffer['dirty'] = size, True
+    return fig
+
+def trace_values(buffers, index, key):
+    buffer = buffers[(index, key)]
+    return buffer['data'][:buffer['size']]
+
+def sync_traces(fig, buffers):
+    # The whole figure is serialized on every render anyway, so the one pass over the history (Plotly's
+    # validation of the full array) happens here, once per render and only for traces that changed
+    for (index, key), buffer in buffers.items():
+        if buffer['dirty']:
+            fig.data[index][key] = trace_values(buffers, index, key)
+            buffer['dirty'] = False
+    return fig
+
+def summarize(values, groups):
+    # Mergeable per-group summary (count, sum, sum of squares, min, max) of one batch
+    summary = values.groupby(groups).agg(['count', 'sum', 'min', 'max'])
+    summary['sum_sq'] = (values ** 2).groupby(groups).sum()
+    return summary
+
+def merge_summaries(summary, batch_summary):
+    # Merging only touches one row per group, so the update cost depends on the batch, not the history
+    merged = summary[['count', 'sum', 'sum_sq']].add(batch_summary[['count', 'sum', 'sum_sq']], fill_value=0)
+    merged['min'] = np.fmin(summary['min'], batch_summary['min'].reindex(summary.index))
+    merged['max'] = np.fmax(summary['max'], batch_summary['max'].reindex(summary.index))
+    return merged
+
+def describe_summary(summary):
+    mean = summary['sum'] / summary['count']
+    std = np.sqrt((summary['sum_sq'] - summary['count'] * mean ** 2) / (summary['count'] - 1))
+    return pd.DataFrame({'count': summary['count'], 'mean': mean, 'std': std,
+                         'min': summary['min'], 'max': summary['max']})
+
 def interactive_demo_tab():
     st.header("Interactive Box Plot Demo")
     
@@ -122,22 +227,25 @@ def interactive_demo_tab():
             "We can see that the median value of tip is larger at the time of dinner.")
     
     st.subheader("Customize the Plot")
-    show_points = st.checkbox("Show All Data Points")
+    mode = st.radio("Box statistics", ["Computed in the browser", "Precomputed on the server"], horizontal=True)
+    precomputed = mode == "Precomputed on the server"
+    plot_data = data
+    if precomputed:
+        n_rows = st.select_slider("Tips per meal", options=[100, 1_000_000, 10_000_000, 100_000_000], value=100)
+        if n_rows > len(data):
+            plot_data = generate_large_tips(n_rows)
+    show_points = st.checkbox("Show Outlier Sample" if precomputed else "Show All Data Points")
     show_mean = st.checkbox("Show Mean")
     notched = st.checkbox("Use Notched Boxes")
     
-    fig = go.Figure()
-    for column in data.columns:
-        fig.add_trace(go.Box(
-            y=data[column],
-            name=column,
-            boxpoints='all' if show_points else False,
-            notched=notched,
-            boxmean=show_mean
-        ))
+    start = time.perf_counter()
+    fig = plot_boxplot(plot_data, "Customized Box Plot of Restaurant Tips", precomputed, cache_key=("tips", len(plot_data)),
+                       boxpoints='all' if show_points else False, notched=notched, boxmean=show_mean)
+    elapsed = time.perf_counter() - start
     
-    fig.update_layout(title="Customized Box Plot of Restaurant Tips")
     st.plotly_chart(fig)
+    if precomputed:
+        st.caption(f"{len(plot_data):,} tips per meal summarized in {elapsed:.2f} s; the figure payload is {len(fig.to_json()) / 1024:.1f} KB")
 
 def restaurant_tip_simulator_tab():
     st.header("Restaurant Tip Simulator")
@@ -151,22 +259,42 @@ def restaurant_tip_simulator_tab():
     lunch_mean = st.slider("Average Lunch Tip", 1.0, 5.0, 2.5, 0.1)
     dinner_mean = st.slider("Average Dinner Tip", 1.0, 5.0, 3.0, 0.1)
     
-    if st.button("Simulate Tips"):
-        new_lunch_tips = np.random.normal(lunch_mean, 1, num_customers // 2)
-        new_dinner_tips = np.random.normal(dinner_mean, 1.5, num_customers - num_customers // 2)
-        
-        simulated_data = pd.DataFrame({
-            'Lunch': np.concatenate([base_data['Lunch'], new_lunch_tips]),
-            'Dinner': np.concatenate([base_data['Dinner'], new_dinner_tips])
-        })
+    col1, col2 = st.columns(2)
+    simulate = col1.button("Simulate Tips")
+    if col2.button("Reset Simulation") or "tip_simulation" not in st.session_state:
+        # The figure and the running summary persist across reruns; each simulation appends to them
+        base_tips = base_data.melt(var_name='meal', value_name='tip')
+        st.session_state.tip_simulation = {
+            'figure': plot_boxplot(base_data, "Simulated Tips Distribution"),
+            'summary': summarize(base_tips['tip'], base_tips['meal']),
+            'customers': 0,
+            'buffers': {},
+            # generate_sample_data reseeds the global state, so batches come from a session-held Generator
+            'rng': np.random.default_rng()
+        }
+    simulation = st.session_state.tip_simulation
+    
+    if simulate:
+        new_lunch_tips = simulation['rng'].normal(lunch_mean, 1, num_customers // 2)
+        new_dinner_tips = simulation['rng'].normal(dinner_mean, 1.5, num_customers - num_customers // 2)
         
-        fig = plot_boxplot(simulated_data, f"Simulated Tips Distribution (Total Customers: {len(simulated_data)})")
-        st.plotly_chart(fig)
+        # Only the new batch is appended to the traces and merged into the summary
+        extend_traces(simulation['figure'], simulation['buffers'], {'y': [new_lunch_tips, new_dinner_tips]}, [0, 1])
+        new_tips = pd.Series(np.concatenate([new_lunch_tips, new_dinner_tips]))
+        meals = np.repeat(['Lunch', 'Dinner'], [len(new_lunch_tips), len(new_dinner_tips)])
+        simulation['summary'] = merge_summaries(simulation['summary'], summarize(new_tips, meals))
+        simulation['customers'] += num_customers
+    
+    if simulation['customers']:
+        sync_traces(simulation['figure'], simulation['buffers'])
+        total_tips = int(simulation['summary']['count'].sum())
+        simulation['figure'].update_layout(title=f"Simulated Tips Distribution (Total Tips: {total_tips})")
+        st.plotly_chart(simulation['figure'])
         
         st.write("Summary Statistics:")
-        st.write(simulated_data.describe())
+        st.write(describe_summary(simulation['summary']).T[base_data.columns])
         
-        explain(f"After simulating tips from {num_customers} new customers, you can see how the distribution of tips has changed. "
+        explain(f"After simulating tips from {simulation['customers']} new customers, you can see how the distribution of tips has changed. "
                 f"This simulation helps understand how changes in tipping patterns can affect the overall distribution of tips for lunch and dinner.")
 
 def quiz_tab():
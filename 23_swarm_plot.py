@@ -108,6 +108,58 @@ def plot_swarmplot(data, title):
     fig.update_traces(jitter=1, marker=dict(size=5))
     return fig
 
+def extend_traces(fig, buffers, update, indices):
+    # Server-side counterpart of Plotly.extendTraces: each batch is copied into a per-trace buffer that doubles
+    # its capacity when full, so appending is amortized O(batch); the trace is refreshed later by sync_traces
+    for key, batches in update.items():
+        for index, batch in zip(indices, batches):
+            batch = np.asarray(batch)
+            if (index, key) not in buffers:
+                current = fig.data[index][key]
+                current = np.asarray(current) if current is not None else np.empty(0, dtype=batch.dtype)
+                buffers[(index, key)] = {'data': current.copy(), 'size': len(current), 'dirty': False}
+            buffer = buffers[(index, key)]
+            size = buffer['size'] + len(batch)
+            if size > len(buffer['data']):
+                grown = np.empty(max(size, 2 * len(buffer['data'])), dtype=np.result_type(buffer['data'], batch))
+                grown[:buffer['size']] = buffer['data'][:buffer['size']]
+                buffer['data'] = grown
+            buffer['data'][buffer['size']:size] = batch
+            buffer['size'], buffer['dirty'] = size, True
+    return fig
+
+def trace_values(buffers, index, key):
+    buffer = buffers[(index, key)]
+    return buffer['data'][:buffer['size']]
+
+def sync_traces(fig, buffers):
+    # The whole figure is serialized on every render anyway, so the one pass over the history (Plotly's
+    # validation of the full array) happens here, once per render and only for traces that changed
+    for (index, key), buffer in buffers.items():
+        if buffer['dirty']:
+            fig.data[index][key] = trace_values(buffers, index, key)
+            buffer['dirty'] = False
+    return fig
+
+def summarize(values, groups):
+    # Mergeable per-group summary (count, sum, sum of squares, min, max) of one batch
+    summary = values.groupby(groups).agg(['count', 'sum', 'min', 'max'])
+    summary['sum_sq'] = (values ** 2).groupby(groups).sum()
+    return summary
+
+def merge_summaries(summary, batch_summary):
+    # Merging only touches one row per group, so the update cost depends on the batch, not the history
+    merged = summary[['count', 'sum', 'sum_sq']].add(batch_summary[['count', 'sum', 'sum_sq']], fill_value=0)
+    merged['min'] = np.fmin(summary['min'], batch_summary['min'].reindex(summary.index))
+    merged['max'] = np.fmax(summary['max'], batch_summary['max'].reindex(summary.index))
+    return merged
+
+def describe_summary(summary):
+    mean = summary['sum'] / summary['count']
+    std = np.sqrt((summary['sum_sq'] - summary['count'] * mean ** 2) / (summary['count'] - 1))
+    return pd.DataFrame({'count': summary['count'], 'mean': mean, 'std': std,
+                         'min': summary['min'], 'max': summary['max']})
+
 def interactive_demo_tab():
     st.header("Interactive Swarm Plot Demo")
     
@@ -145,24 +197,44 @@ def restaurant_tip_simulator_tab():
     weekday_mean = st.slider("Average Weekday Tip", 1.0, 5.0, 3.0, 0.1)
     weekend_mean = st.slider("Average Weekend Tip", 1.0, 7.0, 4.0, 0.1)
     
-    if st.button("Simulate Tips"):
-        new_weekday_tips = np.random.normal(weekday_mean, 1, num_customers * 2)
-        new_weekend_tips = np.random.normal(weekend_mean, 1.5, num_customers * 2)
+    col1, col2 = st.columns(2)
+    simulate = col1.button("Simulate Tips")
+    if col2.button("Reset Simulation") or "swarm_simulation" not in st.session_state:
+        # The figure and the running summary persist across reruns; each simulation appends to them
+        st.session_state.swarm_simulation = {
+            'figure': plot_swarmplot(base_data, "Simulated Tips Distribution"),
+            'summary': summarize(base_data['tip'], base_data['day']),
+            'customers': 0,
+            'buffers': {},
+            # generate_sample_data reseeds the global state, so batches come from a session-held Generator
+            'rng': np.random.default_rng()
+        }
+    simulation = st.session_state.swarm_simulation
+    
+    if simulate:
+        new_weekday_tips = simulation['rng'].normal(weekday_mean, 1, num_customers * 2)
+        new_weekend_tips = simulation['rng'].normal(weekend_mean, 1.5, num_customers * 2)
         
         new_data = pd.DataFrame({
             'day': np.repeat(['Thu', 'Fri', 'Sat', 'Sun'], num_customers),
             'tip': np.concatenate([new_weekday_tips, new_weekend_tips])
         })
         
-        simulated_data = pd.concat([base_data, new_data])
-        
-        fig = plot_swarmplot(simulated_data, f"Simulated Tips Distribution (Total Customers: {len(simulated_data)})")
-        st.plotly_chart(fig)
+        # Only the new batch is appended to the strip trace and merged into the summary
+        extend_traces(simulation['figure'], simulation['buffers'], {'x': [new_data['day']], 'y': [new_data['tip']]}, [0])
+        simulation['summary'] = merge_summaries(simulation['summary'], summarize(new_data['tip'], new_data['day']))
+        simulation['customers'] += num_customers * 4
+    
+    if simulation['customers']:
+        sync_traces(simulation['figure'], simulation['buffers'])
+        total_customers = int(simulation['summary']['count'].sum())
+        simulation['figure'].update_layout(title=f"Simulated Tips Distribution (Total Customers: {total_customers})")
+        st.plotly_chart(simulation['figure'])
         
         st.write("Summary Statistics:")
-        st.write(simulated_data.groupby('day').describe())
+        st.write(describe_summary(simulation['summary']))
         
-        explain(f"After simulating tips from {num_customers * 4} new customers, you can see how the distribution of tips has changed. "
+        explain(f"After simulating tips from {simulation['customers']} new customers, you can see how the distribution of tips has changed. "
                 f"This simulation helps understand how changes in tipping patterns can affect the overall distribution of tips for each day.")
 
 def quiz_tab():
@@ -3,7 +3,6 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from scipy.stats import gaussian_kde
 
 st.set_page_config(layout="wide", page_title="Distribution Plot Exploration")
 
@@ -73,6 +72,31 @@ def generate_sample_data():
         data.extend(zip([car_type] * 1000, horsepower))
     return pd.DataFrame(data, columns=['car_type', 'horsepower'])
 
+def silverman_bandwidth(values):
+    # Silverman's rule of thumb: 0.9 * min(std, IQR / 1.34) * n^(-1/5)
+    q1, q3 = np.percentile(values, [25, 75])
+    spread = min(np.std(values, ddof=1), (q3 - q1) / 1.34) or np.std(values, ddof=1) or 1.0
+    return 0.9 * spread * len(values) ** -0.2
+
+def fft_kde(values, bandwidth=None, grid_size=1024, cut=3):
+    # Gaussian KDE in O(n + g log g): linear binning onto a regular grid, then one FFT convolution with the kernel
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    h = silverman_bandwidth(values) if bandwidth is None else bandwidth
+    grid = np.linspace(values.min() - cut * h, values.max() + cut * h, grid_size)
+    dx = grid[1] - grid[0]
+    # Each value is split between its two neighbouring grid points in proportion to the distance
+    position = (values - grid[0]) / dx
+    left = np.minimum(position.astype(np.int64), grid_size - 2)
+    weight = position - left
+    counts = np.bincount(left, 1 - weight, minlength=grid_size) + np.bincount(left + 1, weight, minlength=grid_size)
+    # Kernel sampled out to 4 bandwidths; zero padding keeps the circular FFT convolution from wrapping around
+    half = min(int(np.ceil(4 * h / dx)), grid_size - 1)
+    kernel = np.exp(-0.5 * (np.arange(-half, half + 1) * dx / h) ** 2) / (h * np.sqrt(2 * np.pi))
+    size = 1 << int(np.ceil(np.log2(grid_size + 2 * half + 1)))
+    density = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)[half:half + grid_size]
+    return grid, np.maximum(density, 0) / len(values)
+
 def plot_distribution(data, title, bin_size=20, show_kde=True):
     fig = make_subplots(rows=1, cols=1)
     
@@ -91,12 +115,11 @@ def plot_distribution(data, title, bin_size=20, show_kde=True):
         
         # Add KDE if selected
         if show_kde:
-            kde_x = np.linspace(car_data.min(), car_data.max(), 100)
-            kde = gaussian_kde(car_data)
+            kde_x, kde = fft_kde(car_data, grid_size=256)
             fig.add_trace(
                 go.Scatter(
                     x=kde_x,
-                    y=kde(kde_x) * len(car_data) * (car_data.max() - car_data.min()) / bin_size,
+                    y=kde * len(car_data) * (car_data.max() - car_data.min()) / bin_size,
                     name=f"{car_type} KDE",
                     mode='lines'
                 )
@@ -111,6 +134,58 @@ def plot_distribution(data, title, bin_size=20, show_kde=True):
     
     return fig
 
+def extend_traces(fig, buffers, update, indices):
+    # Server-side counterpart of Plotly.extendTraces: each batch is copied into a per-trace buffer that doubles
+    # its capacity when full, so appending is amortized O(batch); the trace is refreshed later by sync_traces
+    for key, batches in update.items():
+        for index, batch in zip(indices, batches):
+            batch = np.asarray(batch)
+            if (index, key) not in buffers:
+                current = fig.data[index][key]
+                current = np.asarray(current) if current is not None else np.empty(0, dtype=batch.dtype)
+                buffers[(index, key)] = {'data': current.copy(), 'size': len(current), 'dirty': False}
+            buffer = buffers[(index, key)]
+            size = buffer['size'] + len(batch)
+            if size > len(buffer['data']):
+                grown = np.empty(max(size, 2 * len(buffer['data'])), dtype=np.result_type(buffer['data'], batch))
+                grown[:buffer['size']] = buffer['data'][:buffer['size']]
+                buffer['data'] = grown
+            buffer['data'][buffer['size']:size] = batch
+            buffer['size'], buffer['dirty'] = size, True
+    return fig
+
+def trace_values(buffers, index, key):
+    buffer = buffers[(index, key)]
+    return buffer['data'][:buffer['size']]
+
+def sync_traces(fig, buffers):
+    # The whole figure is serialized on every render anyway, so the one pass over the history (Plotly's
+    # validation of the full array) happens here, once per render and only for traces that changed
+    for (index, key), buffer in buffers.items():
+        if buffer['dirty']:
+            fig.data[index][key] = trace_values(buffers, index, key)
+            buffer['dirty'] = False
+    return fig
+
+def summarize(values, groups):
+    # Mergeable per-group summary (count, sum, sum of squares, min, max) of one batch
+    summary = values.groupby(groups).agg(['count', 'sum', 'min', 'max'])
+    summary['sum_sq'] = (values ** 2).groupby(groups).sum()
+    return summary
+
+def merge_summaries(summary, batch_summary):
+    # Merging only touches one row per group, so the update cost depends on the batch, not the history
+    merged = summary[['count', 'sum', 'sum_sq']].add(batch_summary[['count', 'sum', 'sum_sq']], fill_value=0)
+    merged['min'] = np.fmin(summary['min'], batch_summary['min'].reindex(summary.index))
+    merged['max'] = np.fmax(summary['max'], batch_summary['max'].reindex(summary.index))
+    return merged
+
+def describe_summary(summary):
+    mean = summary['sum'] / summary['count']
+    std = np.sqrt((summary['sum_sq'] - summary['count'] * mean ** 2) / (summary['count'] - 1))
+    return pd.DataFrame({'count': summary['count'], 'mean': mean, 'std': std,
+                         'min': summary['min'], 'max': summary['max']})
+
 def learn_tab():
     st.header("Distribution Plot")
     
@@ -165,25 +240,56 @@ def car_horsepower_simulator_tab():
     suv_mean = st.slider("Average SUV Horsepower", 100, 300, 200)
     sports_car_mean = st.slider("Average Sports Car Horsepower", 200, 500, 300)
     
-    if st.button("Simulate Cars"):
-        new_sedans = np.random.normal(sedan_mean, 20, num_cars)
-        new_suvs = np.random.normal(suv_mean, 30, num_cars)
-        new_sports_cars = np.random.normal(sports_car_mean, 50, num_cars)
+    col1, col2 = st.columns(2)
+    simulate = col1.button("Simulate Cars")
+    if col2.button("Reset Simulation") or "horsepower_simulation" not in st.session_state:
+        # The figure and the running summary persist across reruns; each simulation appends to them
+        st.session_state.horsepower_simulation = {
+            'figure': plot_distribution(base_data, "Simulated Horsepower Distribution"),
+            'summary': summarize(base_data['horsepower'], base_data['car_type']),
+            'cars': 0,
+            'buffers': {},
+            # generate_sample_data reseeds the global state, so batches come from a session-held Generator
+            'rng': np.random.default_rng()
+        }
+    simulation = st.session_state.horsepower_simulation
+    
+    if simulate:
+        new_sedans = simulation['rng'].normal(sedan_mean, 20, num_cars)
+        new_suvs = simulation['rng'].normal(suv_mean, 30, num_cars)
+        new_sports_cars = simulation['rng'].normal(sports_car_mean, 50, num_cars)
         
         new_data = pd.DataFrame({
             'car_type': ['Sedan'] * num_cars + ['SUV'] * num_cars + ['Sports Car'] * num_cars,
             'horsepower': np.concatenate([new_sedans, new_suvs, new_sports_cars])
         })
         
-        simulated_data = pd.concat([base_data, new_data])
-        
-        fig = plot_distribution(simulated_data, f"Simulated Horsepower Distribution (Total Cars: {len(simulated_data)})")
-        st.plotly_chart(fig)
+        # Only the new batch is appended to each histogram trace and merged into the summary
+        fig = simulation['figure']
+        trace_index = {trace.name: i for i, trace in enumerate(fig.data)}
+        car_types = ['Sedan', 'SUV', 'Sports Car']
+        extend_traces(fig, simulation['buffers'], {'x': [new_sedans, new_suvs, new_sports_cars]}, [trace_index[car_type] for car_type in car_types])
+        # A KDE curve cannot be extended point by point, so it is re-evaluated from the histogram's samples
+        bin_size = 20  # plot_distribution's default, used to scale the KDE to counts
+        for car_type in car_types:
+            car_data = trace_values(simulation['buffers'], trace_index[car_type], 'x')
+            kde_trace = fig.data[trace_index[f"{car_type} KDE"]]
+            kde_x, kde = fft_kde(car_data, grid_size=256)
+            kde_trace.x = kde_x
+            kde_trace.y = kde * len(car_data) * (car_data.max() - car_data.min()) / bin_size
+        simulation['summary'] = merge_summaries(simulation['summary'], summarize(new_data['horsepower'], new_data['car_type']))
+        simulation['cars'] += num_cars * 3
+    
+    if simulation['cars']:
+        sync_traces(simulation['figure'], simulation['buffers'])
+        total_cars = int(simulation['summary']['count'].sum())
+        simulation['figure'].update_layout(title=f"Simulated Horsepower Distribution (Total Cars: {total_cars})")
+        st.plotly_chart(simulation['figure'])
         
         st.write("Summary Statistics:")
-        st.write(simulated_data.groupby('car_type').describe())
+        st.write(describe_summary(simulation['summary']))
         
-        explain(f"After simulating {num_cars * 3} new cars, you can see how the distribution of horsepower has changed. "
+        explain(f"After simulating {simulation['cars']} new cars, you can see how the distribution of horsepower has changed. "
                 f"This simulation helps understand how introducing new car models can affect the overall distribution of horsepower across different car types.")
 
 def quiz_tab():
@@ -102,6 +102,39 @@ def plot_pair(data):
     
     return fig
 
+def extend_traces(fig, buffers, update, indices):
+    # Server-side counterpart of Plotly.extendTraces: each batch is copied into a per-trace buffer that doubles
+    # its capacity when full, so appending is amortized O(batch); the trace is refreshed later by sync_traces
+    for key, batches in update.items():
+        for index, batch in zip(indices, batches):
+            batch = np.asarray(batch)
+            if (index, key) not in buffers:
+                current = fig.data[index][key]
+                current = np.asarray(current) if current is not None else np.empty(0, dtype=batch.dtype)
+                buffers[(index, key)] = {'data': current.copy(), 'size': len(current), 'dirty': False}
+            buffer = buffers[(index, key)]
+            size = buffer['size'] + len(batch)
+            if size > len(buffer['data']):
+                grown = np.empty(max(size, 2 * len(buffer['data'])), dtype=np.result_type(buffer['data'], batch))
+                grown[:buffer['size']] = buffer['data'][:buffer['size']]
+                buffer['data'] = grown
+            buffer['data'][buffer['size']:size] = batch
+            buffer['size'], buffer['dirty'] = size, True
+    return fig
+
+def trace_values(buffers, index, key):
+    buffer = buffers[(index, key)]
+    return buffer['data'][:buffer['size']]
+
+def sync_traces(fig, buffers):
+    # The whole figure is serialized on every render anyway, so the one pass over the history (Plotly's
+    # validation of the full array) happens here, once per render and only for traces that changed
+    for (index, key), buffer in buffers.items():
+        if buffer['dirty']:
+            fig.data[index][key] = trace_values(buffers, index, key)
+            buffer['dirty'] = False
+    return fig
+
 def learn_tab():
     st.header("Pair Plot")
     
@@ -185,13 +218,23 @@ def iris_species_analyzer_tab():
     petal_length = st.slider("Petal Length", float(data['petal_length'].min()), float(data['petal_length'].max()), float(data['petal_length'].mean()))
     petal_width = st.slider("Petal Width", float(data['petal_width'].min()), float(data['petal_width'].max()), float(data['petal_width'].mean()))
     
-    if st.button("Analyze Iris"):
-        new_iris = pd.DataFrame({
-            'sepal_length': [sepal_length],
-            'sepal_width': [sepal_width],
-            'petal_length': [petal_length],
-            'petal_width': [petal_width]
-        })
+    col1, col2 = st.columns(2)
+    analyze = col1.button("Analyze Iris")
+    if col2.button("Reset Analysis") or "iris_analysis" not in st.session_state:
+        # The pair plot is built once; analyzed irises are appended to its traces instead of rebuilding it
+        fig = plot_pair(data)
+        fig.add_trace(go.Scatter(x=[], y=[], mode='markers', marker=dict(color='red', size=15, symbol='star'), name='New Iris'), row=2, col=1)
+        fig.add_trace(go.Scatter(x=[], y=[], mode='markers', marker=dict(color='red', size=15, symbol='star'), name='New Iris'), row=4, col=3)
+        st.session_state.iris_analysis = {'figure': fig, 'buffers': {}}
+    analysis = st.session_state.iris_analysis
+    
+    if analyze:
+        new_iris = {
+            'sepal_length': sepal_length,
+            'sepal_width': sepal_width,
+            'petal_length': petal_length,
+            'petal_width': petal_width
+        }
         
         # Simple prediction based on petal length (just for demonstration)
         if petal_length < 2.5:
@@ -203,9 +246,21 @@ def iris_species_analyzer_tab():
         
         st.write(f"Based on these characteristics, this Iris is likely to be: **{prediction}**")
         
-        fig = plot_pair(pd.concat([data, new_iris]))
-        fig.add_trace(go.Scatter(x=[sepal_length], y=[sepal_width], mode='markers', marker=dict(color='red', size=15, symbol='star'), name='New Iris'), row=2, col=1)
-        fig.add_trace(go.Scatter(x=[petal_length], y=[petal_width], mode='markers', marker=dict(color='red', size=15, symbol='star'), name='New Iris'), row=4, col=3)
+        # plot_pair adds one trace per (row, column) cell: histograms on the diagonal, scatters elsewhere
+        fig, buffers = analysis['figure'], analysis['buffers']
+        variables = ['sepal_length', 'sepal_width', 'petal_length', 'petal_width']
+        cells = [(i * len(variables) + j, var1, var2) for i, var1 in enumerate(variables) for j, var2 in enumerate(variables)]
+        diagonal = [(index, var1) for index, var1, var2 in cells if var1 == var2]
+        off_diagonal = [(index, var1, var2) for index, var1, var2 in cells if var1 != var2]
+        extend_traces(fig, buffers, {'x': [[new_iris[var1]] for _, var1 in diagonal]}, [index for index, _ in diagonal])
+        extend_traces(fig, buffers, {
+            'x': [[new_iris[var2]] for _, _, var2 in off_diagonal],
+            'y': [[new_iris[var1]] for _, var1, _ in off_diagonal],
+            'marker.color': [[-1] for _ in off_diagonal]  # unknown species, as in the concatenated frame
+        }, [index for index, _, _ in off_diagonal])
+        star_traces = [len(cells), len(cells) + 1]
+        extend_traces(fig, buffers, {'x': [[sepal_length], [petal_length]], 'y': [[sepal_width], [petal_width]]}, star_traces)
+        sync_traces(fig, buffers)
         st.plotly_chart(fig)
         
         explain(f"The red star shows where your analyzed Iris falls in relation to the existing data. "
@@ -88,6 +88,20 @@ def plot_heatmap(data, title):
     
     return fig
 
+def accumulate_moments(moments, batch):
+    # Running count, column sums and cross-product matrix; a batch update costs O(batch * columns^2)
+    values = batch.to_numpy(dtype=float)
+    batch_moments = {'n': len(values), 'sum': values.sum(axis=0), 'cross': values.T @ values}
+    if moments is None:
+        return batch_moments
+    return {key: moments[key] + batch_moments[key] for key in moments}
+
+def correlation_from_moments(moments, columns):
+    mean = moments['sum'] / moments['n']
+    covariance = moments['cross'] / moments['n'] - np.outer(mean, mean)
+    std = np.sqrt(np.diag(covariance))
+    return pd.DataFrame(covariance / np.outer(std, std), index=columns, columns=columns)
+
 def learn_tab():
     st.header("Heatmap")
     
@@ -157,10 +171,24 @@ def car_feature_simulator_tab():
     hp_weight_correlation = st.slider("Horsepower-Weight Correlation", -1.0, 1.0, 0.8, 0.1)
     hp_accel_correlation = st.slider("Horsepower-Acceleration Correlation", -1.0, 1.0, -0.6, 0.1)
     
-    if st.button("Simulate Cars"):
-        new_horsepower = np.random.normal(200, 30, num_cars)
-        new_weight = hp_weight_correlation * new_horsepower + np.random.normal(0, np.sqrt(1 - hp_weight_correlation**2), num_cars)
-        new_acceleration = hp_accel_correlation * new_horsepower + np.random.normal(0, np.sqrt(1 - hp_accel_correlation**2), num_cars)
+    col1, col2 = st.columns(2)
+    simulate = col1.button("Simulate Cars")
+    if col2.button("Reset Simulation") or "car_simulation" not in st.session_state:
+        # Only the running moments persist across reruns; the heatmap is restyled from them after each batch
+        st.session_state.car_simulation = {
+            'figure': plot_heatmap(base_data, "Simulated Correlation Heatmap"),
+            'moments': accumulate_moments(None, base_data),
+            'cars': 0,
+            # generate_sample_data reseeds the global state, so batches come from a session-held Generator
+            'rng': np.random.default_rng()
+        }
+    simulation = st.session_state.car_simulation
+    
+    if simulate:
+        rng = simulation['rng']
+        new_horsepower = rng.normal(200, 30, num_cars)
+        new_weight = hp_weight_correlation * new_horsepower + rng.normal(0, np.sqrt(1 - hp_weight_correlation**2), num_cars)
+        new_acceleration = hp_accel_correlation * new_horsepower + rng.normal(0, np.sqrt(1 - hp_accel_correlation**2), num_cars)
         
         new_data = pd.DataFrame({
             'horsepower': new_horsepower,
@@ -168,15 +196,20 @@ def car_feature_simulator_tab():
             'acceleration': new_acceleration
         })
         
-        simulated_data = pd.concat([base_data, new_data])
-        
-        fig = plot_heatmap(simulated_data, f"Simulated Correlation Heatmap (Total Cars: {len(simulated_data)})")
+        simulation['moments'] = accumulate_moments(simulation['moments'], new_data)
+        simulation['cars'] += num_cars
+    
+    if simulation['cars']:
+        corr = correlation_from_moments(simulation['moments'], base_data.columns)
+        fig = simulation['figure']
+        fig.update_traces(z=corr.values, text=corr.values)
+        fig.update_layout(title=f"Simulated Correlation Heatmap (Total Cars: {simulation['moments']['n']})")
         st.plotly_chart(fig)
         
         st.write("Correlation Matrix:")
-        st.write(simulated_data.corr())
+        st.write(corr)
         
-        explain(f"After simulating {num_cars} new cars with specified correlations, you can see how the overall correlation heatmap has changed. "
+        explain(f"After simulating {simulation['cars']} new cars with specified correlations, you can see how the overall correlation heatmap has changed. "
                 f"This simulation helps understand how introducing new car models with different characteristics can affect the relationships between variables.")
 
 def quiz_tab():